@@ -2,47 +2,58 @@
 
 import sys
 import time
-import random
-from serial import Serial
-import serial.tools.list_ports
+import argparse
+
+import numpy as np
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QPushButton,
     QLabel, QComboBox, QGroupBox, QVBoxLayout, QHBoxLayout, QGridLayout,
-    QDoubleSpinBox, QScrollArea, QSizePolicy, QTableView
+    QDoubleSpinBox, QScrollArea, QSizePolicy, QTableView, QSlider
 )
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QStandardItemModel, QStandardItem
 
-# Get available serial ports
-available_ports = serial.tools.list_ports.comports()
-selected_port = available_ports[0] if available_ports else None
-# arduino = None  # Uncomment below to initialize with actual serial port
-print(selected_port.device)
-arduino = Serial(port=selected_port.device, baudrate=115200, timeout=.1)
-
-# communicate with the arduino: the write_read function
-def write_read(x):
-    if arduino is None:
-        print("Not connected")
-        return
-    arduino.write(bytes(x, 'utf-8'))
-    time.sleep(0.1)
-
-    data = arduino.readline()
-    print(data)
-
-    return data
+from serial_worker import SerialWorker
+from hub_client import HubClient
+from telemetry_hub import DEFAULT_ADDRESS
+from telemetry_frame import NUM_CHANNELS
+from fake_channels import FakeChannelBank, FAKE_STATUS_SPECS
+from rail_config import RailConfig, RAILS_FILE
+from strip_chart import StripChartCanvas
+from telemetry_buffer import TelemetryStore
+from telemetry_recorder import TelemetryRecorder, new_session_directory
+from telemetry_replay import TelemetryReplay, REPLAY_SPEEDS
+from history_view import HistoryView
+from rail_alarms import RailAlarms
+from status_channels import StatusChannels
+from status_list import STATUS_PANELS
+from power_supply_table import PowerSupplyModel, PowerSupplyTable
+
+# sampling and repainting run on separate timers
+SAMPLE_INTERVAL_MS = 100   # data rate (10 Hz)
+RENDER_INTERVAL_MS = 50    # label refresh cap (20 Hz)
+CHART_INTERVAL_MS = 33     # strip chart refresh (30 fps)
+CHART_SPAN = 60.0          # seconds of history in the strip charts
+
+# every run records the Power Supply channels to a new session directory here
+RECORD_DIR = "telemetry_logs"
+
+# closed status panels kept per type for reuse; more than that are deleted
+STATUS_POOL_SIZE = 2
 
 
 class StatusSelectionWidget(QWidget):
     """
     Widget for selecting and displaying different status group boxes.
     """
-    def __init__(self, temp_label):
+    def __init__(self, channels):
+        """
+        :param channels: StatusChannels the panels subscribe to.
+        """
         super().__init__()
 
-        self.temp_label = temp_label
+        self.channels = channels
         
         self.setWindowTitle("Dynamic GroupBox Example")
         self.resize(400, 250)
@@ -60,6 +71,10 @@ class StatusSelectionWidget(QWidget):
         
         # Container for dynamically added group boxes
         self.status_group_container = QVBoxLayout()
+
+        # panel type per selector index, and closed panels kept for reuse
+        self.panel_types = {1: BatteryStatusWidget, 2: MotorStatusWidget, 3: LEDStatusWidget}
+        self.panel_pools = {panel_type: [] for panel_type in self.panel_types.values()}
         
         # Connect selection change event
         self.status_selector.currentIndexChanged.connect(self.add_status_groupbox)
@@ -70,140 +85,178 @@ class StatusSelectionWidget(QWidget):
         """
         Adds a status group box based on selection.
         """
-        if index == 1:  # Batteries
-            battery_status = BatteryStatusWidget()
-            self.main_layout.addWidget(battery_status)
-        elif index == 2:  # Motors
-            motor_status = MotorStatusWidget()
-            self.main_layout.addWidget(motor_status)
-        elif index == 3:  # LEDs
-            led_status = LEDStatusWidget(self.temp_label)
-            self.main_layout.addWidget(led_status)
+        if index in self.panel_types:
+            panel_type = self.panel_types[index]
+            pool = self.panel_pools[panel_type]
+            if pool:
+                panel = pool.pop()
+            else:
+                panel = panel_type(self.channels)
+                panel.closed.connect(self.remove_status_groupbox)
+            self.main_layout.addWidget(panel)
+            panel.show()
         self.status_selector.setCurrentIndex(0)  # Reset selection
 
+    def remove_status_groupbox(self, panel):
+        """
+        Takes a closed panel out of the layout and keeps it for reuse, or
+        deletes it when enough panels of its type are kept already.
+        """
+        self.main_layout.removeWidget(panel)
+        panel.hide()
+        pool = self.panel_pools[type(panel)]
+        if len(pool) < STATUS_POOL_SIZE:
+            pool.append(panel)
+        else:
+            panel.deleteLater()
+
 
 class SignalStatusWidget(QGroupBox):
     """
     Base widget for signal status (Battery, Motor, LED).
+    Every row shows one named status channel. The panel subscribes to its
+    channels while it is visible and unsubscribes when it is hidden, so
+    closed, pooled or hidden panels get no updates.
+    The "x" button emits closed; the owner decides whether the panel is
+    pooled or deleted.
     """
-    def __init__(self, title: str):
+    closed = pyqtSignal(object)   # the panel
+
+    def __init__(self, title: str, channels, rows):
+        """
+        :param channels: StatusChannels to subscribe to.
+        :param rows: (caption, channel name, format) per row, e.g. ("Voltage", "battery.voltage", "{:.1f}V").
+        """
         super().__init__(title)
         self.layout = QGridLayout(self)
+        self.channels = channels
+        self.formats = {}
+        self.value_labels = {}   # channel name -> labels showing it
+        self._subscribed = False
         
         # Close button
         self.close_button = QPushButton("x")
         self.close_button.setFixedSize(20, 20)
-        self.close_button.clicked.connect(self.close)
+        self.close_button.clicked.connect(lambda: self.closed.emit(self))
         self.layout.addWidget(self.close_button, 0, 2)
+
+        for row, (caption, name, value_format) in enumerate(rows):
+            value_label = QLabel("--")
+            self.layout.addWidget(QLabel(caption), row, 0)
+            self.layout.addWidget(value_label, row, 1)
+            self.formats[name] = value_format
+            self.value_labels.setdefault(name, []).append(value_label)
         
         # Adjust layout stretch for aesthetics
         self.layout.setColumnStretch(0, 1)
         self.layout.setColumnStretch(1, 1)
         self.layout.setColumnStretch(2, 0)
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._subscribed:
+            self._subscribed = True
+            for name in self.value_labels:
+                self.channels.subscribe(name, self.update_channel)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        if self._subscribed:
+            self._subscribed = False
+            for name in self.value_labels:
+                self.channels.unsubscribe(name, self.update_channel)
+
+    def update_channel(self, name, value):
+        text = self.formats[name].format(value)
+        for label in self.value_labels[name]:
+            if label.text() != text:
+                label.setText(text)
+
 class BatteryStatusWidget(SignalStatusWidget):
-    def __init__(self):
-        super().__init__("Battery Status")
-        
-        self.layout.addWidget(QLabel("Battery Status"), 0, 0)
-        self.layout.addWidget(QLabel("Charging"), 0, 1)
-        self.layout.addWidget(QLabel("Voltage"), 1, 0)
-        self.layout.addWidget(QLabel("12.5V"), 1, 1)
-        self.layout.addWidget(QLabel("Current"), 2, 0)
-        self.layout.addWidget(QLabel("0.5A"), 2, 1)
-        self.layout.addWidget(QLabel("Temperature"), 3, 0)
-        self.layout.addWidget(QLabel("25°C"), 3, 1)
+    def __init__(self, channels):
+        title, rows = STATUS_PANELS["battery"]
+        super().__init__(title, channels, rows)
 
 class MotorStatusWidget(SignalStatusWidget):
-    def __init__(self):
-        super().__init__("Motor Status")
-        
-        self.layout.addWidget(QLabel("Motor Status"), 0, 0)
-        self.layout.addWidget(QLabel("Running"), 0, 1)
-        self.layout.addWidget(QLabel("Speed"), 1, 0)
-        self.layout.addWidget(QLabel("1000 RPM"), 1, 1)
-        self.layout.addWidget(QLabel("Torque"), 2, 0)
-        self.layout.addWidget(QLabel("10 Nm"), 2, 1)
-        self.layout.addWidget(QLabel("Temperature"), 3, 0)
-        self.layout.addWidget(QLabel("45°C"), 3, 1)
+    def __init__(self, channels):
+        title, rows = STATUS_PANELS["motor"]
+        super().__init__(title, channels, rows)
 
 class LEDStatusWidget(SignalStatusWidget):
-    def __init__(self, temp_label):
-        super().__init__("LED Status")
-        
-        self.layout.addWidget(QLabel("LED Status"), 0, 0)
-        self.layout.addWidget(temp_label, 0, 1)
-        # self.layout.addWidget(QLabel("Color"), 1, 0)
-        # self.layout.addWidget(QLabel("Green"), 1, 1)
-
-class FakeNumber(QLabel):
-    def __init__(self, current_value: float, ideal_value: float, std_dev: float, alpha: float=0.1, beta: float=0.1):
-        """
-        Fake number label for displaying a number with ideal value and standard deviation.
-        :param current_value: Number to display.
-        :param ideal_value: Ideal value of the number.
-        :param std_dev: Standard deviation of the number.
-        :param alpha: 回归强度
-        :param beta: 随机强度
-        """
-        super().__init__(str(current_value))
-        self.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.current_value = current_value
-        self.ideal_value = ideal_value
-        self.std_dev = std_dev
-        self.alpha = alpha
-        self.beta = beta
-        self.last_delta = ideal_value - current_value
-
-    def generate_smooth_value(self):
-        """
-        生成平滑的电压/电流伪造数据。
-
-        参数:
-        - current_value: float, 当前电压/电流值。
-        - last_delta: float, 上一次的变化值（类似于导数）。
-        - ideal_value: float, 理想的电压/电流值。
-        - sigma: float, 标准差，控制随机波动的幅度。
-        - alpha: float, 默认0.1，控制向理想值回归的强度。
-        - beta: float, 默认0.5，控制变化率的影响。
-
-        返回:
-        - new_value: float, 新的电压/电流值。
-        - new_delta: float, 新的变化值（new_value - current_value）。
-        """
-        # 趋势项：使新值向理想值靠拢
-        trend = self.alpha * (self.ideal_value - self.current_value)
-        # 导数影响：考虑上一次的变化
-        derivative_effect = self.beta * self.last_delta
-        # 随机扰动：从正态分布中抽取
-        noise = random.gauss(0, self.std_dev)
-        # 计算新值
-        new_value = self.current_value + trend + derivative_effect + noise
-        # 计算新的变化值
-        new_delta = new_value - self.current_value
-
-        # 更新状态
-        self.current_value = new_value
-        self.last_delta = new_delta
-        self.setText(f"{new_value:.2f}")
-
+    def __init__(self, channels):
+        title, rows = STATUS_PANELS["led"]
+        super().__init__(title, channels, rows)
 
 class RobotControlGUI(QMainWindow):
     """
     Main GUI for Robot Control.
     """
-    def __init__(self):
+    def __init__(self, replay_dir: str = None, replay_speed: str = "1x", hub: str = None,
+                 rails_file: str = RAILS_FILE):
+        """
+        :param replay_dir: Recorded session to show instead of live data.
+        :param replay_speed: One of REPLAY_SPEEDS.
+        :param hub: Address of a telemetry hub to use instead of the serial port.
+        :param rails_file: Power Supply rail definitions, see rail_config.
+        """
         super().__init__()
 
-        self.temp_label = QLabel("off")
-
-        # store the voltage values and current values
-        self.v_c_values = []
-
-        # set the timer for updating the voltage and current values
+        # every per-rail list and array below is indexed by rail number
+        self.rails = RailConfig.load(rails_file)
+
+        # named status channels shown by the Battery/Motor/LED panels
+        self.status_channels = StatusChannels()
+        self.status_channels.publish("led.state", "off")
+        self.status_channels.publish("battery.state", "Charging")
+        self.status_channels.publish("motor.state", "Running")
+        self.fake_status = FakeChannelBank.from_specs([spec[1:] for spec in FAKE_STATUS_SPECS])
+        self.status_timer = QTimer()
+        self.status_timer.timeout.connect(self.update_status_channels)
+        self.status_timer.start(SAMPLE_INTERVAL_MS)
+
+        # the serial port lives in its own thread so the buttons never block,
+        # it is opened on the first command and reconnects by itself;
+        # with a hub, the hub owns the port and this is only a client
+        self.link_state_label = QLabel("Serial: disconnected")
+        self.serial_worker = SerialWorker() if hub is None else HubClient(hub)
+        self.serial_worker.reply_received.connect(self.handle_serial_reply)
+        self.serial_worker.error_occurred.connect(self.handle_serial_error)
+        self.serial_worker.state_changed.connect(self.handle_serial_state)
+        self.serial_worker.start()
+
+        # history of the voltage and current values
+        self.telemetry = TelemetryStore({"voltage": self.rails.names, "current": self.rails.names})
+        self.samples_ingested = 0
+        self.frames_rendered = 0
+
+        # set the timer for sampling the voltage and current values,
+        # or take them from the hub or a recorded session through the same path
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_v_c_values)
-        self.timer.start(1000)
+        self.replay = None
+        if hub is not None:
+            # the hub's sample frames have a fixed number of channels
+            if 2 * len(self.rails) != NUM_CHANNELS:
+                raise ValueError(f"the hub sends {NUM_CHANNELS} channels, {rails_file} has {len(self.rails)} rails")
+            self.recorder = None
+            self.serial_worker.samples_ready.connect(self.ingest_samples)
+        elif replay_dir is None:
+            self.recorder = TelemetryRecorder(new_session_directory(RECORD_DIR),
+                                              self.rails.channel_names()).start()
+            self.timer.start(SAMPLE_INTERVAL_MS)
+        else:
+            self.recorder = None
+            self.replay = TelemetryReplay(replay_dir, REPLAY_SPEEDS[replay_speed])
+            if self.replay.log.channel_names != self.rails.channel_names():
+                raise ValueError(f"{replay_dir} was recorded with other rails than {rails_file}: "
+                                 f"{', '.join(self.replay.log.channel_names)}")
+            self.replay.samples_ready.connect(self.ingest_samples)
+
+        # and a separate one for showing them
+        self.v_c_dirty = False
+        self.render_timer = QTimer()
+        self.render_timer.timeout.connect(self.render_v_c_values)
+        self.render_timer.start(RENDER_INTERVAL_MS)
 
         self.setWindowTitle("Robot Operating System")
         
@@ -220,7 +273,7 @@ class RobotControlGUI(QMainWindow):
         # Signals & Status Section
         status_group = QGroupBox("Signals and Status")
         status_layout = QVBoxLayout(status_group)
-        self.status_widget = StatusSelectionWidget(self.temp_label)
+        self.status_widget = StatusSelectionWidget(self.status_channels)
         status_layout.addWidget(self.status_widget)
         left_layout.addWidget(status_group)
 
@@ -239,168 +292,263 @@ class RobotControlGUI(QMainWindow):
         LED_button_ON.clicked.connect(self.handle_led_on)
         LED_button_OFF.clicked.connect(self.handle_led_off)
         LED_button_BLINK.clicked.connect(self.handle_led_blink)
+
+        # link health section:
+        link_group = QGroupBox("Link")
+        link_layout = QGridLayout(link_group)
+        link_layout.addWidget(self.link_state_label, 0, 0, 1, 4)
+        self.link_labels = {}
+        link_fields = [("Commands", "commands"), ("Timeouts", "timeouts"),
+                       ("p50 (ms)", "p50"), ("p95 (ms)", "p95"), ("p99 (ms)", "p99"),
+                       ("Reconnects", "reconnects"), ("In (B/s)", "in_rate"), ("Out (B/s)", "out_rate")]
+        for i, (name, key) in enumerate(link_fields):
+            self.link_labels[key] = QLabel("--")
+            link_layout.addWidget(QLabel(name), 1 + i // 2, (i % 2) * 2)
+            link_layout.addWidget(self.link_labels[key], 1 + i // 2, (i % 2) * 2 + 1)
+        left_layout.addWidget(link_group)
+
+        # replay section:
+        if self.replay is not None:
+            left_layout.addWidget(self.build_replay_group(replay_speed))
+
+        # refresh the link statistics once a second
+        self.last_link_stats = self.serial_worker.stats.snapshot()
+        self.link_timer = QTimer()
+        self.link_timer.timeout.connect(self.update_link_stats)
+        self.link_timer.timeout.connect(self.update_replay_stats)
+        self.link_timer.start(1000)
         
         # Power Supply Section
         self.power_group = QGroupBox("Power Supply")
-        self.power_layout = QGridLayout(self.power_group)
-
-        self.power_layout.addWidget(QLabel("Voltage"), 0, 0)
-        self.power_layout.addWidget(QLabel("Specification"), 0, 1)
-        self.power_layout.addWidget(QLabel("Operation Voltage(V)"), 0, 2)   
-        self.power_layout.addWidget(QLabel("Operation Current(mA)"), 0, 3)
-        self.power_layout.addWidget(QLabel("Status"), 0, 4)
-        self.power_layout.addWidget(QLabel("Control"), 0, 5)
-
-        # voltage
-        self.power_layout.addWidget(QLabel("3.3V"), 1, 0)
-        self.power_layout.addWidget(QLabel("5V"), 2, 0)
-        self.power_layout.addWidget(QLabel("12V"), 3, 0)
-        self.power_layout.addWidget(QLabel("19V"), 4, 0)
-        self.power_layout.addWidget(QLabel("24V"), 5, 0)
-        self.power_layout.addWidget(QLabel("56V"), 6, 0)
-
-        # specification
-        self.power_layout.addWidget(QLabel("Main Controller"), 1, 1)
-        self.power_layout.addWidget(QLabel("Tire Power Control Signals, Network Switch"), 2, 1)
-        self.power_layout.addWidget(QLabel("AUX"), 3, 1)
-        self.power_layout.addWidget(QLabel("Computer"), 4, 1)
-        self.power_layout.addWidget(QLabel("Antenna, Cameras"), 5, 1)
-        self.power_layout.addWidget(QLabel("Special Scientific Camera, Main Bus"), 6, 1)
-
-        # real voltage
-        self.v_c_values.append(FakeNumber(3.29, 3.3, 0.1))
-        self.power_layout.addWidget(self.v_c_values[-1], 1, 2)
-        self.v_c_values.append(FakeNumber(4.89, 5, 0.1))
-        self.power_layout.addWidget(self.v_c_values[-1], 2, 2)
-        self.v_c_values.append(FakeNumber(11.98, 12, 0.1))
-        self.power_layout.addWidget(self.v_c_values[-1], 3, 2)
-        self.v_c_values.append(FakeNumber(19.05, 19, 0.1))
-        self.power_layout.addWidget(self.v_c_values[-1], 4, 2)
-        self.v_c_values.append(FakeNumber(23.95, 24, 0.1))
-        self.power_layout.addWidget(self.v_c_values[-1], 5, 2)
-        self.v_c_values.append(FakeNumber(55.80, 56, 0.1))
-        self.power_layout.addWidget(self.v_c_values[-1], 6, 2)
-
-        # real current
-        self.v_c_values.append(FakeNumber(11.9, 12, 0.1))
-        self.power_layout.addWidget(self.v_c_values[-1], 1, 3)
-        self.v_c_values.append(FakeNumber(29.5, 30, 0.1))
-        self.power_layout.addWidget(self.v_c_values[-1], 2, 3)
-        self.v_c_values.append(FakeNumber(1120, 1100, 10))
-        self.power_layout.addWidget(self.v_c_values[-1], 3, 3)
-        self.v_c_values.append(FakeNumber(5900, 6000, 50))
-        self.power_layout.addWidget(self.v_c_values[-1], 4, 3)
-        self.v_c_values.append(FakeNumber(3203, 3200, 20))
-        self.power_layout.addWidget(self.v_c_values[-1], 5, 3)
-        self.v_c_values.append(FakeNumber(4732, 4700, 30))
-        self.power_layout.addWidget(self.v_c_values[-1], 6, 3)
+        self.power_layout = QVBoxLayout(self.power_group)
 
-        # status:
-        self.status_3_3 = QLabel("--", self)
-        self.status_5 = QLabel("--", self)
-        self.status_12 = QLabel("--", self)
-        self.status_19 = QLabel("--", self)
-        self.status_24 = QLabel("--", self)
-        self.status_56 = QLabel("--", self)
-
-        self.power_layout.addWidget(self.status_3_3, 1, 4)
-        self.power_layout.addWidget(self.status_5, 2, 4)
-        self.power_layout.addWidget(self.status_12, 3, 4)
-        self.power_layout.addWidget(self.status_19, 4, 4)
-        self.power_layout.addWidget(self.status_24, 5, 4)
-        self.power_layout.addWidget(self.status_56, 6, 4)
-
-        # control
-        #for i in range(1,7):
-            # power_layout.addWidget(QPushButton("ON"), i, 5)
-            # power_layout.addWidget(QPushButton("OFF"), i, 6)
-        button_3_3_on = QPushButton("ON")
-        button_3_3_off = QPushButton("OFF")
-        button_5_on = QPushButton("ON")
-        button_5_off = QPushButton("OFF")
-        button_12_on = QPushButton("ON")
-        button_12_off = QPushButton("OFF")
-        button_19_on = QPushButton("ON")
-        button_19_off = QPushButton("OFF")
-        button_24_on = QPushButton("ON")
-        button_24_off = QPushButton("OFF")
-        button_56_on = QPushButton("ON")
-        button_56_off = QPushButton("OFF")
-        self.power_layout.addWidget(button_3_3_on, 1, 5)
-        self.power_layout.addWidget(button_3_3_off, 1, 6)
-        self.power_layout.addWidget(button_5_on, 2, 5)
-        self.power_layout.addWidget(button_5_off, 2, 6)
-        self.power_layout.addWidget(button_12_on, 3, 5)
-        self.power_layout.addWidget(button_12_off, 3, 6)
-        self.power_layout.addWidget(button_19_on, 4, 5)
-        self.power_layout.addWidget(button_19_off, 4, 6)
-        self.power_layout.addWidget(button_24_on, 5, 5)
-        self.power_layout.addWidget(button_24_off, 5, 6)
-        self.power_layout.addWidget(button_56_on, 6, 5)
-        self.power_layout.addWidget(button_56_off, 6, 6)
-
-        # handle click:
-        button_3_3_on.clicked.connect(self.handle_on_3_3)
-        button_3_3_off.clicked.connect(self.handle_off_3_3)
-        button_5_on.clicked.connect(self.handle_on_5)
-        button_5_off.clicked.connect(self.handle_off_5)
-        button_12_on.clicked.connect(self.handle_on_12)
-        button_12_off.clicked.connect(self.handle_off_12)
-        button_19_on.clicked.connect(self.handle_on_19)
-        button_19_off.clicked.connect(self.handle_off_19)
-        button_24_on.clicked.connect(self.handle_on_24)
-        button_24_off.clicked.connect(self.handle_off_24)
-        button_56_on.clicked.connect(self.handle_on_56)
-        button_56_off.clicked.connect(self.handle_off_56)
-
-        # self.power_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        for widget in self.power_group.findChildren(QLabel):
-            widget.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        # one table row per rail, painted by the model/view instead of a widget per cell
+        self.power_model = PowerSupplyModel(self.rails.names, self.rails.descriptions)
+        self.power_table = PowerSupplyTable(self.power_model)
+        self.power_table.delegate.switch_clicked.connect(self.set_rail_power)
+        self.power_layout.addWidget(self.power_table)
 
+        # real voltage and real current, faked for now
+        self.fake_channels = FakeChannelBank.from_specs(self.rails.fake_specs())
+
+        # status:
+        self.rail_alarms = RailAlarms(self.rails.nominal_voltage, self.rails.tolerance,
+                                      self.rails.max_current, self.rails.nominal_current)
+        self.show_alarms(range(len(self.rails)))
 
         right_layout.addWidget(self.power_group)
+
+        # Power Supply charts
+        chart_group = QGroupBox("Power Supply History")
+        chart_layout = QVBoxLayout(chart_group)
+        chart_titles = [f"{name} voltage (V)" for name in self.rails.names] + \
+                       [f"{name} current (mA)" for name in self.rails.names]
+        chart_ranges = [(ideal - 6 * std, ideal + 6 * std) for ideal, std in
+                        zip(self.fake_channels.ideal_value, self.fake_channels.std_dev)]
+        self.chart_canvas = StripChartCanvas(chart_titles, chart_ranges, span=CHART_SPAN)
+        chart_layout.addWidget(self.chart_canvas)
+        right_layout.addWidget(chart_group)
+
+        self.chart_timer = QTimer()
+        self.chart_timer.timeout.connect(self.update_charts)
+        self.chart_timer.start(CHART_INTERVAL_MS)
         
         # Emergency Stop Section
         emergency_group = QGroupBox("Emergency Stop")
         emergency_layout = QGridLayout(emergency_group)
         
         go_button = QPushButton("GO")
-        turn_off_main_bus_button = QPushButton("Turn off the Main Bus")
-        turn_off_partially = QPushButton("Turn off everything except 3.3V, 5V, 19V")
         stop_button = QPushButton("STOP")
         
         go_button.clicked.connect(self.on_go)
-        turn_off_main_bus_button.clicked.connect(self.handle_turnoff_main_bus)
-        turn_off_partially.clicked.connect(self.handle_turnoff_partially)
         stop_button.clicked.connect(self.on_stop)
 
         emergency_layout.addWidget(stop_button, 0, 0)
-        emergency_layout.addWidget(turn_off_partially, 1, 0)
-        emergency_layout.addWidget(turn_off_main_bus_button, 2,0)
-        emergency_layout.addWidget(go_button, 3, 0)
+        # one button per group operation in the rail config
+        for row, (label, off) in enumerate(self.rails.operations, start=1):
+            operation_button = QPushButton(label)
+            operation_button.clicked.connect(lambda checked, off=off: self.switch_rails_off(off))
+            emergency_layout.addWidget(operation_button, row, 0)
+        emergency_layout.addWidget(go_button, len(self.rails.operations) + 1, 0)
         
         right_layout.addWidget(emergency_group)
 
+    def build_replay_group(self, speed):
+        replay_group = QGroupBox("Replay")
+        replay_layout = QGridLayout(replay_group)
+
+        self.replay_play_button = QPushButton("Play")
+        self.replay_play_button.clicked.connect(self.handle_replay_play)
+        replay_layout.addWidget(self.replay_play_button, 0, 0)
+
+        self.replay_speed_selector = QComboBox()
+        self.replay_speed_selector.addItems(list(REPLAY_SPEEDS))
+        self.replay_speed_selector.setCurrentText(speed)
+        self.replay_speed_selector.currentTextChanged.connect(self.handle_replay_speed)
+        replay_layout.addWidget(self.replay_speed_selector, 0, 1)
+
+        # slider positions are tenths of a second from the start of the log
+        self.replay_slider = QSlider(Qt.Orientation.Horizontal)
+        self.replay_slider.setRange(0, int((self.replay.end_time - self.replay.start_time) * 10))
+        self.replay_slider.sliderReleased.connect(self.handle_replay_seek)
+        replay_layout.addWidget(self.replay_slider, 1, 0, 1, 2)
+
+        self.replay_position_label = QLabel("0.0 s")
+        replay_layout.addWidget(self.replay_position_label, 2, 0)
+        self.replay_rate_label = QLabel("--")
+        replay_layout.addWidget(self.replay_rate_label, 2, 1)
+
+        # the whole session, with pan/zoom
+        history_button = QPushButton("History")
+        history_button.clicked.connect(self.handle_replay_history)
+        replay_layout.addWidget(history_button, 3, 0, 1, 2)
+        self.history_view = None
+
+        self.replay.position_changed.connect(self.handle_replay_position)
+        self.replay.finished.connect(lambda: self.replay_play_button.setText("Play"))
+        self.last_replay_stats = (time.monotonic(), 0, 0)
+        return replay_group
+
     def update_v_c_values(self):
         # print("update voltage and current values")
-        for v_c_value in self.v_c_values:
-            v_c_value.generate_smooth_value()
+        # only store the sample here, render_v_c_values shows it
+        values = self.fake_channels.step()
+        now = time.monotonic()
+        voltages, currents = self.rails.split(values)
+        self.telemetry.append("voltage", voltages, now)
+        self.telemetry.append("current", currents, now)
+        self.recorder.record(now, values)
+        self.samples_ingested += 1
+        self.v_c_dirty = True
+        self.show_alarms(self.rail_alarms.update(voltages, currents))
+
+    def ingest_samples(self, times, values):
+        # a batch of recorded or hub samples, N timestamps and N x (2 * rails) values;
+        # the sources were checked against the rails in __init__
+        voltages, currents = self.rails.split(values)
+        self.telemetry["voltage"].extend(times, voltages)
+        self.telemetry["current"].extend(times, currents)
+        self.samples_ingested += len(times)
+        self.v_c_dirty = True
+        self.show_alarms(self.rail_alarms.update_many(voltages, currents))
+
+    def show_alarms(self, rails):
+        # only the rails whose alarm state changed are repainted
+        self.power_model.set_states(self.rail_alarms.state, list(rails))
+
+    def set_rail_enabled(self, rail, enabled):
+        self.rail_alarms.set_enabled(rail, enabled)
+        self.show_alarms([rail])
+
+    def render_v_c_values(self):
+        # the model repaints only the cells whose shown value actually changed
+        if not self.v_c_dirty:
+            return
+        self.v_c_dirty = False
+        self.frames_rendered += 1
+        self.power_model.set_values(self.telemetry["voltage"].latest(), self.telemetry["current"].latest())
+
+    def update_charts(self):
+        times, voltages = self.telemetry["voltage"].window(CHART_SPAN)
+        _, currents = self.telemetry["current"].window(CHART_SPAN)
+        channels = [voltages[:, i] for i in range(len(self.rails))] + \
+                   [currents[:, i] for i in range(len(self.rails))]
+        self.chart_canvas.update_lines(times, channels)
+
+    def closeEvent(self, event):
+        # nothing may record or draw after the recorder has stopped
+        for timer in (self.timer, self.render_timer, self.chart_timer, self.status_timer, self.link_timer):
+            timer.stop()
+        if self.replay is not None:
+            self.replay.pause()
+        self.serial_worker.stop()
+        if self.recorder is not None:
+            try:
+                self.recorder.stop()
+            except Exception as e:
+                print("Recording failed:", e)
+        super().closeEvent(event)
+
+    # functions in replay section:
+    def handle_replay_play(self):
+        if self.replay.playing:
+            self.replay.pause()
+            self.replay_play_button.setText("Play")
+        else:
+            self.replay.play()
+            self.replay_play_button.setText("Pause")
+
+    def handle_replay_speed(self, speed):
+        self.replay.set_speed(REPLAY_SPEEDS[speed])
+
+    def handle_replay_history(self):
+        if self.history_view is None:
+            self.history_view = HistoryView(self.replay.log.directory)
+        self.history_view.show()
+        self.history_view.raise_()
+
+    def handle_replay_seek(self):
+        self.telemetry.clear()
+        self.replay.seek(self.replay.start_time + self.replay_slider.value() / 10)
+
+    def handle_replay_position(self, t):
+        offset = t - self.replay.start_time
+        self.replay_position_label.setText(f"{offset:.1f} s")
+        if not self.replay_slider.isSliderDown():
+            self.replay_slider.setValue(int(offset * 10))
+
+    def update_replay_stats(self):
+        # how many samples per second the display pipeline absorbs, and how
+        # many label frames it still manages to paint meanwhile
+        if self.replay is None:
+            return
+        now = time.monotonic()
+        last_time, last_samples, last_frames = self.last_replay_stats
+        elapsed = now - last_time
+        self.last_replay_stats = (now, self.samples_ingested, self.frames_rendered)
+        self.replay_rate_label.setText(
+            f"{(self.samples_ingested - last_samples) / elapsed:.0f} samples/s, "
+            f"{(self.frames_rendered - last_frames) / elapsed:.0f} fps")
 
     # Related functions:
+    # functions in serial communication:
+    def handle_serial_reply(self, command, lines):
+        print(lines)
+
+    def handle_serial_error(self, command, message):
+        print("Serial error:", command.strip(), message)
+
+    def handle_serial_state(self, state):
+        self.link_state_label.setText(f"Serial: {state}")
+
+    def update_link_stats(self):
+        stats = self.serial_worker.stats.snapshot()
+        stats["in_rate"] = stats["bytes_in"] - self.last_link_stats["bytes_in"]
+        stats["out_rate"] = stats["bytes_out"] - self.last_link_stats["bytes_out"]
+        self.last_link_stats = stats
+        for key, label in self.link_labels.items():
+            value = stats[key]
+            label.setText(f"{value:.2f}" if isinstance(value, float) else str(value))
+
+    def update_status_channels(self):
+        # Battery and Motor values, faked for now
+        for (name, *_), value in zip(FAKE_STATUS_SPECS, self.fake_status.step().tolist()):
+            self.status_channels.publish(name, value)
+
     # functions in LED control section:
     def handle_led_on(self):
-        write_read("green on\n")
-        self.temp_label.setText("on")
+        self.serial_worker.send_latest("led", "green on\n")
+        self.status_channels.publish("led.state", "on")
         print("LED_ON")
 
     def handle_led_off(self):
-        write_read("off\n")
-        self.temp_label.setText("off")
+        self.serial_worker.send_latest("led", "off\n")
+        self.status_channels.publish("led.state", "off")
         print("LED_OFF")
 
     def handle_led_blink(self):
-        write_read("green blink\n")
-        self.temp_label.setText("blink")
+        self.serial_worker.send_latest("led", "green blink\n")
+        self.status_channels.publish("led.state", "blink")
         print("LED_BLINK")
 
     # functions in E STOP section: 
@@ -410,67 +558,33 @@ class RobotControlGUI(QMainWindow):
     def on_stop(self):
         print("Stop pressed")
 
-    def handle_turnoff_main_bus(self):
-        print("turn off the main bus")
-    
-    def handle_turnoff_partially(self):
-        print("turn off everything except 19v, 3.3v, 5v")
+    def switch_rails_off(self, off):
+        # group operation: off is a boolean mask over the rails
+        for rail in np.flatnonzero(off):
+            self.set_rail_power(int(rail), False)
 
     # functions in Power Supply Section:
-    def handle_on_3_3(self):
-        self.status_3_3.setText("ON")
-        print("3.3 ON")
-
-    def handle_off_3_3(self):
-        self.status_3_3.setText("OFF")
-        print("3.3 OFF")
-        
-    def handle_on_5(self):
-        self.status_5.setText("ON")
-        print("5 ON")
-
-    def handle_off_5(self):
-        self.status_5.setText("OFF")
-        print("5 OFF")
-
-    def handle_on_12(self):
-        self.status_12.setText("ON")
-        print("12 ON")
-
-    def handle_off_12(self):
-        self.status_12.setText("OFF")
-        print("12 OFF")
-
-    def handle_on_19(self):
-        self.status_19.setText("ON")
-        print("19 ON")
-
-    def handle_off_19(self):
-        self.status_19.setText("OFF")
-        print("19 OFF")
-
-    def handle_on_24(self):
-        self.status_24.setText("ON")
-        print("24 ON")
-
-    def handle_off_24(self):
-        self.status_24.setText("OFF")
-        print("24 OFF")
-
-    def handle_on_56(self):
-        self.status_56.setText("ON")
-        print("56 ON")
-
-    def handle_off_56(self):
-        self.status_56.setText("OFF")
-        print("56 OFF")
+    def set_rail_power(self, rail, on):
+        # coalesced per rail, so only the last click on a rail is sent
+        self.serial_worker.send_latest(f"rail {self.rails.ids[rail]}", self.rails.command(rail, on))
+        self.set_rail_enabled(rail, on)
+        print(self.rails.names[rail], "ON" if on else "OFF")
 
 # Main function to run the application
 def main():
+    parser = argparse.ArgumentParser(description="Rover control GUI")
+    parser.add_argument("--replay", metavar="DIR", help="show a recorded session from telemetry_logs instead of live data")
+    parser.add_argument("--speed", choices=list(REPLAY_SPEEDS), default="1x", help="replay speed")
+    parser.add_argument("--hub", metavar="ADDRESS", nargs="?", const=DEFAULT_ADDRESS,
+                        help="use a running telemetry_hub.py instead of the serial port")
+    parser.add_argument("--rails", metavar="FILE", default=RAILS_FILE, help="Power Supply rail definitions")
+    args, qt_args = parser.parse_known_args()
     try:
-        app = QApplication(sys.argv)
-        gui = RobotControlGUI()
+        app = QApplication(sys.argv[:1] + qt_args)
+        gui = RobotControlGUI(args.replay, args.speed, args.hub, args.rails)
         gui.show()
+        if gui.replay is not None:
+            gui.handle_replay_play()
         sys.exit(app.exec())
     except Exception as e:
         print("Error: ", e)
@@ -1,22 +1,92 @@
-import serial
+import sys
 import time
+import argparse
+import serial
 import serial.tools.list_ports
 
-ports = serial.tools.list_ports.comports()
-for port in ports:
-	print(port.device)
-port = ports[0].device
-arduino = serial.Serial(port=port, baudrate=115200, timeout=.1)
+from link_stats import LinkStats
+from port_discovery import discover_port
+from serial_protocol import ResponseParser, PipelinedSender, transact
+
+
+def write_read(arduino, parser, x):
+	try:
+		return transact(arduino, x, parser)
+	except TimeoutError as e:
+		return e
+
+
+def interactive(arduino):
+	parser = ResponseParser()
+	while True:
+		command = input("Enter your command: ") # Taking input from user
+		value = write_read(arduino, parser, command + '\n')
+		print(value) # printing the value
+
+
+def batch(arduino, commands, window, timeout, results):
+	"""
+	Stream all commands through the link with up to `window` in flight,
+	write one result line per command and print a throughput summary.
+	"""
+	stats = LinkStats()
+	sender = PipelinedSender(arduino, window, timeout, stats)
+	start = time.monotonic()
+	futures = [sender.submit(command + '\n') for command in commands]
+	sender.drain()
+	elapsed = time.monotonic() - start
+
+	for command, future in zip(commands, futures):
+		error = future.exception()
+		if error is not None:
+			results.write(f"{command}\tERROR {error}\n")
+		else:
+			reply = " | ".join(line.decode('utf-8', 'replace') for line in future.result())
+			results.write(f"{command}\t{reply}\n")
+
+	summary = stats.snapshot()
+	print(f"{len(commands)} commands in {elapsed:.3f}s "
+		f"({len(commands) / elapsed if elapsed else 0:.1f} commands/s, window {window})", file=sys.stderr)
+	print(f"latency p50 {summary['p50']:.2f} ms, p95 {summary['p95']:.2f} ms, p99 {summary['p99']:.2f} ms", file=sys.stderr)
+	print(f"timeouts {summary['timeouts']}, bytes out {summary['bytes_out']}, bytes in {summary['bytes_in']}", file=sys.stderr)
+	return summary['timeouts'] == 0
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Send commands to the rover controller")
+	parser.add_argument("port", nargs="?", help="serial device, e.g. the pty of fake_stm32.py")
+	parser.add_argument("--batch", metavar="FILE", help="send every line of FILE ('-' for stdin) and exit")
+	parser.add_argument("--window", type=int, default=4, help="commands in flight in batch mode")
+	parser.add_argument("--timeout", type=float, default=1.0, help="seconds to wait for a response")
+	parser.add_argument("--results", metavar="FILE", help="write the replies here instead of stdout")
+	args = parser.parse_args()
+
+	if args.port:
+		port = args.port
+	else:
+		ports = serial.tools.list_ports.comports()
+		for port in ports:
+			print(port.device)
+		if not ports:
+			sys.exit("no serial port found")
+		port = discover_port() or ports[0].device
+	print("using", port, file=sys.stderr)
+	arduino = serial.Serial(port=port, baudrate=115200, timeout=.1)
 
+	if args.batch is None:
+		interactive(arduino)
+		return
 
-def write_read(x):
-	arduino.write(bytes(x, 'utf-8'))
-	time.sleep(0.05)
-	response = arduino.readline()
-	return response
+	source = sys.stdin if args.batch == '-' else open(args.batch)
+	with source:
+		commands = [line.strip() for line in source if line.strip()]
+	if args.results:
+		with open(args.results, 'w') as results:
+			ok = batch(arduino, commands, args.window, args.timeout, results)
+	else:
+		ok = batch(arduino, commands, args.window, args.timeout, sys.stdout)
+	sys.exit(0 if ok else 1)
 
 
-while True:
-	command = input("Enter your command: ") # Taking input from user
-	value = write_read(command + '\n')
-	print(value) # printing the value
+if __name__ == "__main__":
+	main()
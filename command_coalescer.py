@@ -0,0 +1,70 @@
+import threading
+
+
+class CommandCoalescer:
+    """
+    Keeps only the latest desired command per target (e.g. "led", a rail).
+    A command that has not been sent yet is replaced by a newer one for the
+    same target, a target is never sent twice at the same time, and a command
+    equal to the last one the device acknowledged is skipped. A burst of
+    clicks therefore costs at most one transaction per target.
+    Thread safe: put() is called by the GUI, take()/acknowledge() by the serial thread.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._desired = {}    # target -> command, waiting to be sent
+        self._in_flight = {}  # target -> command, sent, no reply yet
+        self._acked = {}      # target -> last command the device answered
+
+    def put(self, target: str, command: str) -> bool:
+        """
+        Set the desired command for a target.
+        :return: False if nothing has to be sent for it.
+        """
+        with self._lock:
+            if target not in self._in_flight and self._acked.get(target) == command:
+                # the device is already in this state, forget older wishes
+                self._desired.pop(target, None)
+                return False
+            self._desired[target] = command
+            return True
+
+    def ready(self) -> bool:
+        """
+        True if take() would return something.
+        """
+        with self._lock:
+            return any(target not in self._in_flight for target in self._desired)
+
+    def take(self) -> list:
+        """
+        Remove and return the commands that can be sent now.
+        :return: List of (target, command); targets still in flight are kept back.
+        """
+        with self._lock:
+            ready = [(target, command) for target, command in self._desired.items()
+                     if target not in self._in_flight]
+            for target, command in ready:
+                del self._desired[target]
+                self._in_flight[target] = command
+            return ready
+
+    def acknowledge(self, target: str, command: str, ok: bool):
+        """
+        Report the outcome of a command returned by take().
+        """
+        with self._lock:
+            self._in_flight.pop(target, None)
+            if ok:
+                self._acked[target] = command
+            else:
+                self._acked.pop(target, None)
+            if target in self._desired and self._desired[target] == self._acked.get(target):
+                del self._desired[target]
+
+    def forget(self):
+        """
+        The device state is unknown again, e.g. after a reconnect.
+        """
+        with self._lock:
+            self._acked.clear()
@@ -0,0 +1,201 @@
+"""
+Downsampling for plotting long telemetry sessions.
+
+A plot never needs more than about two points per horizontal pixel, so the
+visible part of a long series is reduced before it is handed to Matplotlib:
+- minmax: the minimum and maximum of every bucket, so spikes never vanish.
+- lttb: Largest-Triangle-Three-Buckets, a closer look of the curve's shape.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+
+def minmax_index(y, size: int):
+    """
+    Indices of the minimum and the maximum of every bucket of `size` points
+    (the last bucket may be shorter), in order.
+    """
+    n = len(y)
+    n_buckets = n // size
+    full = n_buckets * size
+    blocks = y[:full].reshape(n_buckets, size)
+    index = np.stack([blocks.argmin(axis=1), blocks.argmax(axis=1)], axis=1)
+    index.sort(axis=1)
+    index = (index + np.arange(0, full, size)[:, None]).ravel()
+    if full < n:
+        tail = y[full:]
+        index = np.concatenate([index, np.sort([full + tail.argmin(), full + tail.argmax()])])
+    return index
+
+
+def minmax(x, y, n_out: int):
+    """
+    Keep the minimum and the maximum of n_out // 2 equal buckets, in time order.
+    :return: (x, y) with at most n_out (+2 for a partial last bucket) points.
+    """
+    n = len(x)
+    n_buckets = n_out // 2
+    if n <= n_out or n_buckets < 1:
+        return x, y
+    index = minmax_index(y, n // n_buckets)
+    return x[index], y[index]
+
+
+def lttb_index(x, y, n_out: int):
+    """
+    Indices kept by Largest-Triangle-Three-Buckets: the first and last point
+    and, from each of the n_out - 2 buckets in between, the point that makes
+    the largest triangle with the previously kept point and the average of
+    the next bucket. The bucket averages and areas are computed with NumPy;
+    only the walk over the buckets (each depends on the previous choice) is
+    a Python loop.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    n_buckets = n_out - 2
+    edges = np.linspace(1, n - 1, n_buckets + 1).astype(np.int64)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(y[:n - 1], edges[:-1]) / counts
+    # the "third point" of bucket i is the average of bucket i + 1, or the last point
+    next_x = np.append(mean_x[1:], x[n - 1])
+    next_y = np.append(mean_y[1:], y[n - 1])
+
+    index = np.empty(n_out, dtype=np.int64)
+    index[0], index[-1] = 0, n - 1
+    a = 0
+    for i in range(n_buckets):
+        low, high = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - next_x[i]) * (y[low:high] - ay) - (ax - x[low:high]) * (next_y[i] - ay))
+        a = low + int(area.argmax())
+        index[i + 1] = a
+    return index
+
+
+def lttb(x, y, n_out: int):
+    """
+    Largest-Triangle-Three-Buckets, see lttb_index.
+    """
+    index = lttb_index(x, y, n_out)
+    return x[index], y[index]
+
+
+# points kept per bucket by each method
+POINTS_PER_BUCKET = {"minmax": 2, "lttb": 1}
+
+# buckets per cached tile
+TILE_BUCKETS = 512
+
+
+class Downsampler:
+    """
+    Downsamples the visible window of one (x, y) series, with x sorted.
+    Zoom levels have buckets of 2**level points, aligned to the start of the
+    series, and every level is cut into tiles of TILE_BUCKETS buckets. A view
+    takes the level that gives about points_per_pixel points per pixel for
+    the visible range and joins the tiles it covers. Tiles are cached, so
+    panning only computes the tiles that come into view, and zooming back to
+    a level reuses its tiles; the cost of a view depends on the pixel width,
+    not on the length of the series.
+    """
+    def __init__(self, x, y, method: str = "minmax", points_per_pixel: int = 2, cache_size: int = 256):
+        """
+        :param method: "minmax" (spikes always stay visible) or "lttb".
+        :param cache_size: Tiles kept, over all zoom levels.
+        """
+        self.method = method
+        self.points_per_bucket = POINTS_PER_BUCKET[method]
+        self.points_per_pixel = points_per_pixel
+        self.cache_size = cache_size
+        self._cache = OrderedDict()   # (level, tile) -> indices into x and y
+        self.set_data(x, y)
+
+    def set_data(self, x, y):
+        self.x = np.asarray(x)
+        self.y = np.asarray(y)
+        self._cache.clear()
+
+    def view(self, x_min: float, x_max: float, pixel_width: int):
+        """
+        Points to draw for the range [x_min, x_max] on an axes `pixel_width` pixels wide.
+        One point outside the range is kept on each side so the line reaches the edges.
+        """
+        start = max(int(np.searchsorted(self.x, x_min, side='left')) - 1, 0)
+        stop = min(int(np.searchsorted(self.x, x_max, side='right')) + 1, len(self.x))
+        n_out = max(self.points_per_pixel * int(pixel_width), 4)
+        if stop - start <= n_out:
+            return self.x[start:stop], self.y[start:stop]
+        buckets = n_out // self.points_per_bucket
+        level = int(np.log2((stop - start) / buckets))
+        span = TILE_BUCKETS << level
+        index = np.concatenate([self._tile(level, tile) for tile in range(start // span, (stop - 1) // span + 1)])
+        low = max(int(np.searchsorted(index, start, side='right')) - 1, 0)
+        high = int(np.searchsorted(index, stop - 1, side='left')) + 1
+        index = index[low:high]
+        # the buckets' extremes rarely are the end points, add them so the line reaches the edges
+        if index[0] > start:
+            index = np.concatenate([[start], index])
+        if index[-1] < stop - 1:
+            index = np.concatenate([index, [stop - 1]])
+        return self.x[index], self.y[index]
+
+    def _tile(self, level: int, tile: int):
+        key = (level, tile)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        size = 1 << level
+        low = tile * TILE_BUCKETS * size
+        high = min(low + TILE_BUCKETS * size, len(self.x))
+        if self.method == "minmax":
+            index = minmax_index(self.y[low:high], size)
+        else:
+            index = lttb_index(self.x[low:high], self.y[low:high], -(-(high - low) // size) + 2)
+        index = index + low
+        self._cache[key] = index
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return index
+
+
+class DownsampledLine:
+    """
+    A Matplotlib line that redraws its data through a Downsampler whenever
+    the x limits of its axes change (pan/zoom), e.g. on an MplCanvas.
+    """
+    def __init__(self, ax, x=None, y=None, method: str = "minmax", downsampler=None, **plot_kwargs):
+        """
+        :param downsampler: Used instead of x and y: any object with x (sorted,
+            spanning the data) and view(x_min, x_max, pixel_width), e.g. a
+            history_view.ChannelHistory.
+        """
+        self.ax = ax
+        self.downsampler = downsampler if downsampler is not None else Downsampler(x, y, method)
+        self.line, = ax.plot([], [], **plot_kwargs)
+        self._callback = ax.callbacks.connect('xlim_changed', self._on_xlim_changed)
+        if len(self.downsampler.x):
+            ax.set_xlim(self.downsampler.x[0], self.downsampler.x[-1])
+        self.refresh()
+
+    def set_data(self, x, y):
+        self.downsampler.set_data(x, y)
+        self.refresh()
+
+    def refresh(self):
+        x_min, x_max = self.ax.get_xlim()
+        x, y = self.downsampler.view(x_min, x_max, self.ax.bbox.width)
+        self.line.set_data(x, y)
+
+    def remove(self):
+        """
+        Take the line off the axes and stop following its x limits.
+        """
+        self.ax.callbacks.disconnect(self._callback)
+        self.line.remove()
+
+    def _on_xlim_changed(self, ax):
+        self.refresh()
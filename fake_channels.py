@@ -0,0 +1,78 @@
+import numpy as np
+
+# fake Battery and Motor status channels: (name, start value, ideal value, standard deviation)
+FAKE_STATUS_SPECS = [
+    ("battery.voltage", 12.5, 12.5, 0.02), ("battery.current", 0.5, 0.5, 0.01),
+    ("battery.temperature", 25, 25, 0.05), ("motor.speed", 1000, 1000, 5),
+    ("motor.torque", 10, 10, 0.1), ("motor.temperature", 45, 45, 0.05),
+]
+
+
+class FakeChannelBank:
+    """
+    Fake voltage/current data for many channels at once.
+    Every channel follows the same mean-reverting process that FakeNumber used:
+        new_value = value + alpha * (ideal - value) + beta * last_delta + gauss(0, std_dev)
+        last_delta = new_value - value
+    (alpha pulls the value back to the ideal value, beta keeps some of the last
+    change, the noise makes it move), but the whole bank is advanced by one
+    NumPy step on state arrays, so the cost per tick barely depends on the
+    number of channels.
+    """
+    def __init__(self, current_value, ideal_value, std_dev, alpha=0.1, beta=0.1, seed=None):
+        """
+        Every argument is one value per channel (alpha and beta may be scalars).
+        :param current_value: Starting values.
+        :param ideal_value: Ideal values the channels return to.
+        :param std_dev: Standard deviation of the noise.
+        :param alpha: Strength of the pull towards the ideal value.
+        :param beta: Share of the last change that is kept.
+        :param seed: Seed for the random numbers.
+        """
+        self.current_value = np.array(current_value, dtype=np.float64)
+        n = len(self.current_value)
+        self.ideal_value = np.array(ideal_value, dtype=np.float64)
+        self.std_dev = np.array(std_dev, dtype=np.float64)
+        self.alpha = np.broadcast_to(np.asarray(alpha, dtype=np.float64), n).copy()
+        self.beta = np.broadcast_to(np.asarray(beta, dtype=np.float64), n).copy()
+        self.last_delta = self.ideal_value - self.current_value
+        self.rng = np.random.default_rng(seed)
+        self._delta = np.empty(n)
+        self._noise = np.empty(n)
+
+    @classmethod
+    def from_specs(cls, specs, seed=None):
+        """
+        Build a bank from FakeNumber-style tuples
+        (current_value, ideal_value, std_dev[, alpha[, beta]]).
+        """
+        columns = [[], [], [], [], []]
+        for spec in specs:
+            spec = tuple(spec) + (0.1, 0.1)[len(spec) - 3:]
+            for column, value in zip(columns, spec):
+                column.append(value)
+        return cls(*columns, seed=seed)
+
+    def __len__(self):
+        return len(self.current_value)
+
+    def step(self):
+        """
+        Advance every channel by one sample.
+        :return: The new values (the bank's own array, do not modify).
+        """
+        delta, noise = self._delta, self._noise
+        # trend: pull towards the ideal value
+        np.subtract(self.ideal_value, self.current_value, out=delta)
+        delta *= self.alpha
+        # derivative: keep part of the last change
+        self.last_delta *= self.beta
+        delta += self.last_delta
+        # noise
+        self.rng.standard_normal(out=noise)
+        noise *= self.std_dev
+        delta += noise
+
+        self.current_value += delta
+        self._delta, self.last_delta = self.last_delta, delta
+        return self.current_value
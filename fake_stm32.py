@@ -0,0 +1,135 @@
+"""
+Fake STM32 board on a pseudo-terminal.
+
+Behaves like the main loop in fadsfasd.c: reads bytes until '\\r', '\\n', '\\0'
+or a full buffer, echoes the message, answers "green"/"red"/"blue"/"off" with
+the same word and always finishes with "end". Latency, jitter, baud rate and
+dropped bytes can be set to load-test the serial code without hardware.
+
+Usage:
+    python fake_stm32.py --latency 0.002 --jitter 0.001 --baud 115200
+and open the printed device, e.g. SerialWorker(port=...) or
+python arduinotest.py <device>.
+"""
+
+import os
+import sys
+import tty
+import time
+import random
+import select
+import argparse
+import threading
+
+MAX_BUFFER_SIZE = 128
+REPLIES = {b"green", b"red", b"blue", b"off"}
+
+
+class FakeSTM32:
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, baudrate: int = None,
+                 drop_rate: float = 0.0, seed: int = None):
+        """
+        :param latency: Seconds between the end of a command and the reply.
+        :param jitter: Standard deviation (seconds) added to the latency.
+        :param baudrate: Throttle replies to this line rate, None for no limit.
+        :param drop_rate: Probability that a received byte is lost (UART overrun).
+        :param seed: Seed for the jitter and drop random numbers.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.baudrate = baudrate
+        self.drop_rate = drop_rate
+        self.random = random.Random(seed)
+
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)
+        self.port = os.ttyname(self.slave)
+
+        self.commands_handled = 0
+        self.bytes_dropped = 0
+        self._message = bytearray()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+        os.close(self.master)
+        os.close(self.slave)
+
+    def run(self):
+        while self._running:
+            readable, _, _ = select.select([self.master], [], [], 0.1)
+            if not readable:
+                continue
+            try:
+                data = os.read(self.master, 4096)
+            except OSError:
+                break
+            for byte in data:
+                if self.drop_rate and self.random.random() < self.drop_rate:
+                    self.bytes_dropped += 1
+                    continue
+                self._receive_byte(byte)
+
+    def _receive_byte(self, byte):
+        # same rules as UART_Receive_Message
+        self._message.append(byte)
+        if byte in b"\r\n\0" or len(self._message) >= MAX_BUFFER_SIZE - 1:
+            del self._message[-1]
+            message = bytes(self._message)
+            self._message.clear()
+            self._handle_message(message)
+
+    def _handle_message(self, message):
+        delay = self.latency
+        if self.jitter:
+            delay += self.random.gauss(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        reply = message + b"\r\n"
+        if message in REPLIES:
+            reply += message + b"\r\n"
+        reply += b"end\r\n"
+        self._transmit(reply)
+        self.commands_handled += 1
+
+    def _transmit(self, data):
+        if self.baudrate:
+            # 8N1: 10 bits per byte on the wire
+            time.sleep(len(data) * 10 / self.baudrate)
+        os.write(self.master, data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake fadsfasd.c board on a pty")
+    parser.add_argument("--latency", type=float, default=0.0, help="reply latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="latency standard deviation in seconds")
+    parser.add_argument("--baud", type=int, default=None, help="throttle replies to this baud rate")
+    parser.add_argument("--drop", type=float, default=0.0, help="probability of dropping a received byte")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    board = FakeSTM32(args.latency, args.jitter, args.baud, args.drop, args.seed)
+    print(board.port, flush=True)
+    board.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print(f"handled {board.commands_handled} commands, dropped {board.bytes_dropped} bytes",
+              file=sys.stderr)
+    finally:
+        board.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Pan/zoom plot of one channel of a recorded session, at any session length.
+
+A channel is never loaded whole. When it is first shown, its segments
+are read one at a time from the TelemetryLog memmaps and reduced to an
+overview of at most OVERVIEW_BUCKETS buckets, whose zoom-level tiles the
+Downsampler caches. Views that need more detail than the overview has read
+only the visible records with TelemetryLog.time_range(). The overview is
+kept per channel and method, so switching back to a channel costs nothing.
+Every pan or zoom draws about two points per pixel of the visible range.
+
+Usage:
+    python history_view.py telemetry_logs/20250301_142501
+"""
+
+import sys
+import argparse
+
+import numpy as np
+
+from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QLabel
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_qtagg import NavigationToolbar2QT as NavigationToolbar
+from matplotlib.figure import Figure
+
+from downsample import Downsampler, DownsampledLine, POINTS_PER_BUCKET, minmax, minmax_index, lttb, lttb_index
+from telemetry_recorder import TelemetryLog
+
+# most buckets in the overview of one channel, whatever the session length
+OVERVIEW_BUCKETS = 1 << 19
+
+
+class ChannelHistory:
+    """
+    Downsampled views of one channel of a TelemetryLog, in seconds from the
+    start of the session. The overview is built one segment at a time with
+    buckets of a power of two records, chosen so it has at most
+    overview_buckets buckets; wider views are cut from it through a
+    Downsampler, narrower ones from the records themselves.
+    """
+    def __init__(self, log: TelemetryLog, column: int, method: str = "minmax", points_per_pixel: int = 2,
+                 overview_buckets: int = OVERVIEW_BUCKETS):
+        """
+        :param column: Channel, an index into log.channel_names.
+        :param method: "minmax" or "lttb".
+        """
+        self.log = log
+        self.column = column
+        self.method = method
+        self.points_per_pixel = points_per_pixel
+        self.t0 = float(log.first_t[0]) if len(log.manifest) else 0.0
+        self.bucket = 1 << max(int(np.ceil(np.log2(max(len(log), 1) / overview_buckets))), 0)
+        times, values = [], []
+        for segment in log.segments():
+            t = np.asarray(segment["t"], dtype=np.float64) - self.t0
+            y = np.asarray(segment["values"][:, column], dtype=np.float64)
+            if self.bucket > 1:
+                if method == "minmax":
+                    # keep the segment's end points so the overview spans the whole session
+                    index = np.unique(np.concatenate([[0], minmax_index(y, self.bucket), [len(y) - 1]]))
+                else:
+                    index = lttb_index(t, y, -(-len(t) // self.bucket) + 2)
+                t, y = t[index], y[index]
+            times.append(t)
+            values.append(y)
+        self.overview = Downsampler(np.concatenate(times) if times else np.empty(0),
+                                    np.concatenate(values) if values else np.empty(0),
+                                    method, points_per_pixel)
+        self.x = self.overview.x
+
+    def view(self, x_min: float, x_max: float, pixel_width: int):
+        """
+        Points to draw for [x_min, x_max] (seconds from the start) on an axes
+        `pixel_width` pixels wide.
+        """
+        x, y = self.overview.view(x_min, x_max, pixel_width)
+        n_out = max(self.points_per_pixel * int(pixel_width), 4)
+        if self.bucket == 1 or len(x) >= n_out:
+            return x, y
+        # the overview is too coarse here, use the records themselves
+        parts = list(self.log.time_range(self.t0 + x_min, self.t0 + x_max))
+        if not parts:
+            return x, y
+        t = np.concatenate([part["t"] for part in parts]).astype(np.float64) - self.t0
+        v = np.concatenate([part["values"][:, self.column] for part in parts]).astype(np.float64)
+        return (minmax if self.method == "minmax" else lttb)(t, v, n_out)
+
+
+class HistoryView(QWidget):
+    """
+    Window with a channel selector, a downsampling method selector and a
+    Matplotlib plot with the pan/zoom toolbar.
+    """
+    def __init__(self, directory: str, parent=None):
+        """
+        :param directory: Session directory, finished, running or crashed.
+        """
+        super().__init__(parent)
+        self.setWindowTitle(f"History: {directory}")
+        self.log = TelemetryLog(directory)
+        self.channels = {}   # (column, method) -> ChannelHistory
+
+        layout = QVBoxLayout(self)
+        selectors = QHBoxLayout()
+        layout.addLayout(selectors)
+        self.channel_selector = QComboBox()
+        self.channel_selector.addItems(self.log.channel_names)
+        selectors.addWidget(self.channel_selector)
+        self.method_selector = QComboBox()
+        self.method_selector.addItems(list(POINTS_PER_BUCKET))
+        selectors.addWidget(self.method_selector)
+        self.points_label = QLabel()
+        selectors.addWidget(self.points_label)
+
+        self.figure = Figure(figsize=(8, 4), dpi=100, layout="constrained")
+        self.canvas = FigureCanvas(self.figure)
+        self.ax = self.figure.add_subplot(111)
+        self.ax.set_xlabel("s")
+        self.ax.grid(True)
+        layout.addWidget(NavigationToolbar(self.canvas, self))
+        layout.addWidget(self.canvas)
+
+        self.line = None
+        self.channel_selector.currentIndexChanged.connect(self.show_channel)
+        self.method_selector.currentTextChanged.connect(self.show_channel)
+        self.canvas.mpl_connect("draw_event", self._update_points_label)
+        self.show_channel()
+
+    def show_channel(self, *args):
+        key = (self.channel_selector.currentIndex(), self.method_selector.currentText())
+        if key not in self.channels:
+            self.channels[key] = ChannelHistory(self.log, *key)
+        channel = self.channels[key]
+        if self.line is not None:
+            self.line.remove()
+        self.ax.set_title(self.channel_selector.currentText())
+        self.line = DownsampledLine(self.ax, downsampler=channel, lw=1)
+        if len(channel.x):
+            low, high = channel.overview.y.min(), channel.overview.y.max()
+            margin = 0.05 * (high - low) or 1.0
+            self.ax.set_ylim(low - margin, high + margin)
+        self.canvas.draw_idle()
+
+    def _update_points_label(self, event):
+        self.points_label.setText(f"{len(self.line.line.get_xdata())} of {len(self.log)} points drawn")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pan/zoom plot of a recorded telemetry session")
+    parser.add_argument("directory", help="session directory, e.g. telemetry_logs/20250301_142501")
+    args, qt_args = parser.parse_known_args()
+    app = QApplication(sys.argv[:1] + qt_args)
+    view = HistoryView(args.directory)
+    view.show()
+    sys.exit(app.exec())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import socket
+
+import numpy as np
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtNetwork import QLocalSocket, QTcpSocket
+
+from telemetry_frame import (
+    FrameDecoder, encode_message, decode_samples, decode_message,
+    FRAME_SAMPLES, FRAME_REPLY, FRAME_ERROR, FRAME_STATE, FRAME_STATS, FRAME_DROPPED,
+    FRAME_COMMAND, DROPPED,
+)
+from telemetry_hub import DEFAULT_ADDRESS, parse_address
+
+
+class HubStats:
+    """
+    The link statistics last sent by the hub, with the LinkStats.snapshot() keys.
+    """
+    def __init__(self):
+        self._snapshot = {"commands": 0, "timeouts": 0, "bytes_in": 0, "bytes_out": 0,
+                          "reconnects": 0, "p50": 0.0, "p95": 0.0, "p99": 0.0}
+
+    def update(self, snapshot: dict):
+        self._snapshot = snapshot
+
+    def snapshot(self) -> dict:
+        return dict(self._snapshot)
+
+
+class HubClient(QObject):
+    """
+    Connection to a telemetry hub (telemetry_hub.py), for viewers that must not
+    open the serial port themselves. It has the same signals and send methods
+    as SerialWorker, so the GUI can use either, plus samples_ready with the
+    batches of Power Supply samples the hub fans out.
+    Runs on the Qt event loop (QLocalSocket / QTcpSocket); reconnects every
+    `reconnect_ms` while the hub is not there.
+    """
+    reply_received = pyqtSignal(str, list)    # command, reply lines
+    error_occurred = pyqtSignal(str, str)     # command, error message
+    state_changed = pyqtSignal(str)           # connection state
+    samples_ready = pyqtSignal(object, object)   # timestamps (N,) in seconds, values (N, 12)
+    samples_dropped = pyqtSignal(int)            # samples the hub skipped for this client
+
+    def __init__(self, address: str = DEFAULT_ADDRESS, reconnect_ms: int = 1000):
+        super().__init__()
+        self.family, self.address = parse_address(address)
+        self.stats = HubStats()
+        self.dropped = 0
+        self.decoder = FrameDecoder()
+        self._wraps = 0        # the hub's timestamps are uint32 microseconds
+        self._last_t = None
+
+        self.socket = QLocalSocket(self) if self.family == socket.AF_UNIX else QTcpSocket(self)
+        self.socket.readyRead.connect(self._read)
+        self.socket.connected.connect(lambda: self.state_changed.emit("hub connected"))
+        self.socket.disconnected.connect(self._lost)
+        self.socket.errorOccurred.connect(self._lost)
+        self.reconnect_timer = QTimer(self)
+        self.reconnect_timer.setSingleShot(True)
+        self.reconnect_timer.setInterval(reconnect_ms)
+        self.reconnect_timer.timeout.connect(self.start)
+
+    def start(self):
+        if self.family == socket.AF_UNIX:
+            self.socket.connectToServer(self.address)
+        else:
+            self.socket.connectToHost(*self.address)
+
+    def stop(self):
+        self.reconnect_timer.stop()
+        self.socket.disconnected.disconnect(self._lost)
+        self.socket.errorOccurred.disconnect(self._lost)
+        self.socket.abort()
+
+    def send(self, command: str):
+        self._write({"command": command})
+
+    def send_latest(self, target: str, command: str):
+        """
+        Coalesced per target by the hub, like SerialWorker.send_latest.
+        """
+        self._write({"command": command, "target": target})
+
+    def _write(self, message):
+        if not self._is_connected():
+            self.error_occurred.emit(message["command"], "Not connected to the hub")
+            return
+        self.socket.write(encode_message(FRAME_COMMAND, message))
+
+    def _is_connected(self):
+        if self.family == socket.AF_UNIX:
+            return self.socket.state() == QLocalSocket.LocalSocketState.ConnectedState
+        return self.socket.state() == QTcpSocket.SocketState.ConnectedState
+
+    def _lost(self, *args):
+        self.state_changed.emit("hub disconnected")
+        self.decoder = FrameDecoder()
+        # a restarted hub counts from a low timestamp again, that is not a wrap
+        self._wraps, self._last_t = 0, None
+        if not self.reconnect_timer.isActive():
+            self.reconnect_timer.start()
+
+    def _read(self):
+        # a viewer that was busy can have megabytes waiting, read them in
+        # pieces the decoder can always take
+        while self.socket.bytesAvailable():
+            try:
+                frames = self.decoder.feed(bytes(self.socket.read(self.decoder.chunk_size)))
+            except BufferError:
+                self.decoder.reset()
+                continue
+            self._handle(frames)
+
+    def _handle(self, frames):
+        for frame_type, payload in frames:
+            if frame_type == FRAME_SAMPLES:
+                samples = decode_samples(payload)
+                self.samples_ready.emit(self._seconds(samples["t"]), samples["values"].astype(np.float64))
+            elif frame_type == FRAME_REPLY:
+                message = decode_message(payload)
+                self.reply_received.emit(message["command"], message["reply"])
+            elif frame_type == FRAME_ERROR:
+                message = decode_message(payload)
+                self.error_occurred.emit(message["command"], message["error"])
+            elif frame_type == FRAME_STATE:
+                self.state_changed.emit(decode_message(payload)["state"])
+            elif frame_type == FRAME_STATS:
+                self.stats.update(decode_message(payload))
+            elif frame_type == FRAME_DROPPED:
+                (count,) = DROPPED.unpack(payload)
+                self.dropped += count
+                self.samples_dropped.emit(count)
+
+    def _seconds(self, t_us):
+        # unwrap the uint32 microsecond counter into monotonic seconds
+        t = t_us.astype(np.int64)
+        if len(t) == 0:
+            return t / 1e6
+        wraps = np.cumsum(np.diff(t, prepend=t[0] if self._last_t is None else self._last_t) < 0)
+        t += (self._wraps + wraps) << 32
+        self._wraps += int(wraps[-1])
+        self._last_t = int(t_us[-1])
+        return t / 1e6
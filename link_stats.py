@@ -0,0 +1,104 @@
+import threading
+
+
+class LatencyHistogram:
+    """
+    Fixed-size log-linear histogram of latencies in microseconds (HDR style).
+    Values below 2**sub_bucket_bits are counted exactly; above that every power
+    of two is split into 2**(sub_bucket_bits - 1) buckets, so the relative
+    error of a percentile is below 2**-(sub_bucket_bits - 1) (about 3% by default).
+    Recording is O(1) and the memory does not grow with the number of samples.
+    """
+    def __init__(self, max_value_us: int = 10_000_000, sub_bucket_bits: int = 6):
+        self.bits = sub_bucket_bits
+        self.sub = 1 << sub_bucket_bits
+        self.half = self.sub >> 1
+        self.max_value = max_value_us
+        self.counts = [0] * (self._index(max_value_us) + 1)
+        self.total = 0
+
+    def _index(self, value: int) -> int:
+        if value < self.sub:
+            return value
+        magnitude = value.bit_length() - self.bits
+        return self.sub + (magnitude - 1) * self.half + ((value >> magnitude) - self.half)
+
+    def _value_at(self, index: int) -> int:
+        if index < self.sub:
+            return index
+        magnitude = (index - self.sub) // self.half + 1
+        top = (index - self.sub) % self.half + self.half
+        # middle of the bucket
+        return (top << magnitude) + (1 << magnitude) // 2
+
+    def record(self, value_us: float):
+        value = min(max(int(value_us), 0), self.max_value)
+        self.counts[self._index(value)] += 1
+        self.total += 1
+
+    def percentile(self, p: float) -> int:
+        """
+        :param p: Percentile between 0 and 100.
+        :return: Latency in microseconds, 0 if nothing was recorded.
+        """
+        if self.total == 0:
+            return 0
+        wanted = max(1, round(self.total * p / 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= wanted:
+                return self._value_at(index)
+        return self.max_value
+
+    def reset(self):
+        self.counts = [0] * len(self.counts)
+        self.total = 0
+
+
+class LinkStats:
+    """
+    Counters for the serial link, written by the serial thread and read by the GUI.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = LatencyHistogram()
+        self.commands = 0
+        self.timeouts = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.reconnects = 0
+
+    def record_latency(self, seconds: float):
+        with self._lock:
+            self.latency.record(seconds * 1e6)
+            self.commands += 1
+
+    def record_timeouts(self, count: int = 1):
+        with self._lock:
+            self.timeouts += count
+
+    def record_bytes(self, received: int = 0, sent: int = 0):
+        with self._lock:
+            self.bytes_in += received
+            self.bytes_out += sent
+
+    def record_reconnect(self):
+        with self._lock:
+            self.reconnects += 1
+
+    def snapshot(self) -> dict:
+        """
+        Consistent copy of the counters; latencies are in milliseconds.
+        """
+        with self._lock:
+            return {
+                "commands": self.commands,
+                "timeouts": self.timeouts,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "reconnects": self.reconnects,
+                "p50": self.latency.percentile(50) / 1000,
+                "p95": self.latency.percentile(95) / 1000,
+                "p99": self.latency.percentile(99) / 1000,
+            }
@@ -1,99 +1,19 @@
 import sys
+import argparse
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QPushButton,
     QLabel, QLineEdit, QGridLayout, QComboBox, QGroupBox,
     QVBoxLayout, QHBoxLayout, QSpinBox, QDoubleSpinBox, QLCDNumber,
-    QScrollArea, QSizePolicy
+    QSizePolicy
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 
+from fake_channels import FakeChannelBank, FAKE_STATUS_SPECS
+from status_channels import StatusChannels
+from status_list import STATUS_PANELS, StatusListModel, StatusListView
 
-
-class SignalStatusWidget(QGroupBox):
-    """
-    The custom widget for signal status.
-    There are few types of widgets:
-    1. battery status
-    2. motor status
-    3. LED status
-    """
-
-    def __init__(self, widget_type: str):
-        super().__init__("Signal Status")
-
-        ss_layout = QGridLayout(self)
-        self._layout = ss_layout
-
-        # The close button
-        ss_close_button = QPushButton("X")
-        ss_close_button.setFixedSize(20, 20)
-        ss_layout.addWidget(ss_close_button, 0, 2)
-
-        # Set the layout stretch to make the close button not consume too much space
-        ss_layout.setColumnStretch(0, 1)
-        ss_layout.setColumnStretch(1, 1)
-        ss_layout.setColumnStretch(2, 0)
-
-
-class BatteryStatusWidget(SignalStatusWidget):
-    def __init__(self):
-        super().__init__("battery")
-
-        ss_layout = self._layout
-
-        ss_layout.addWidget(QLabel("Battery Status"), 0, 0)
-        battery_status = QLabel("Charging")
-        ss_layout.addWidget(battery_status, 0, 1)
-
-        ss_layout.addWidget(QLabel("Voltage"), 1, 0)
-        battery_voltage = QLabel("12.5V")
-        ss_layout.addWidget(battery_voltage, 1, 1)
-
-        ss_layout.addWidget(QLabel("Current"), 2, 0)
-        battery_current = QLabel("0.5A")
-        ss_layout.addWidget(battery_current, 2, 1)
-
-        ss_layout.addWidget(QLabel("Temperature"), 3, 0)
-        battery_temp = QLabel("25°C")
-        ss_layout.addWidget(battery_temp, 3, 1)
-
-
-class MotorStatusWidget(SignalStatusWidget):
-    def __init__(self):
-        super().__init__("motor")
-
-        ss_layout = self._layout
-
-        ss_layout.addWidget(QLabel("Motor Status"), 0, 0)
-        motor_status = QLabel("Running")
-        ss_layout.addWidget(motor_status, 0, 1)
-
-        ss_layout.addWidget(QLabel("Speed"), 1, 0)
-        motor_speed = QLabel("1000 RPM")
-        ss_layout.addWidget(motor_speed, 1, 1)
-
-        ss_layout.addWidget(QLabel("Torque"), 2, 0)
-        motor_torque = QLabel("10 Nm")
-        ss_layout.addWidget(motor_torque, 2, 1)
-
-        ss_layout.addWidget(QLabel("Temperature"), 3, 0)
-        motor_temp = QLabel("45°C")
-        ss_layout.addWidget(motor_temp, 3, 1)
-
-
-class LEDStatusWidget(SignalStatusWidget):
-    def __init__(self):
-        super().__init__("LED")
-
-        ss_layout = self._layout
-
-        ss_layout.addWidget(QLabel("LED Status"), 0, 0)
-        led_status = QLabel("On")
-        ss_layout.addWidget(led_status, 0, 1)
-
-        ss_layout.addWidget(QLabel("Color"), 1, 0)
-        led_color = QLabel("Green")
-        ss_layout.addWidget(led_color, 1, 1)
+# fake status values are published at this rate (10 Hz)
+STATUS_INTERVAL_MS = 100
 
 
 class PowerSupplyWidget(QGroupBox):
@@ -108,10 +28,24 @@ class PowerSupplyWidget(QGroupBox):
 
 
 class RobotGUI(QMainWindow):
-    def __init__(self):
+    def __init__(self, panels: int = 6):
+        """
+        :param panels: Status panels to start with (battery, motor and LED in turn).
+        """
         super().__init__()
         self.setWindowTitle("Robot Operating System")
 
+        # named status channels shown by the status panels, faked for now
+        self.status_channels = StatusChannels()
+        self.status_channels.publish("led.state", "On")
+        self.status_channels.publish("led.color", "Green")
+        self.status_channels.publish("battery.state", "Charging")
+        self.status_channels.publish("motor.state", "Running")
+        self.fake_status = FakeChannelBank.from_specs([spec[1:] for spec in FAKE_STATUS_SPECS])
+        self.status_timer = QTimer()
+        self.status_timer.timeout.connect(self.update_status_channels)
+        self.status_timer.start(STATUS_INTERVAL_MS)
+
         # 中心主窗口部件
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -132,26 +66,26 @@ class RobotGUI(QMainWindow):
         path_entry_group = QGroupBox("Signals and Status")
         path_entry_layout = QGridLayout(path_entry_group)
 
-        path_entry_content = QWidget()
-        path_entry_content_layout = QVBoxLayout(path_entry_content)
-
-        path_entry_content_layout.addWidget(BatteryStatusWidget())
-        path_entry_content_layout.addWidget(MotorStatusWidget())
-        path_entry_content_layout.addWidget(LEDStatusWidget())
-        path_entry_content_layout.addWidget(BatteryStatusWidget())
-        path_entry_content_layout.addWidget(MotorStatusWidget())
-        path_entry_content_layout.addWidget(LEDStatusWidget())
+        # the panels are rows of a list model painted by the view,
+        # so only the ones in view are laid out and drawn
+        self.status_model = StatusListModel(self.status_channels)
+        kinds = list(STATUS_PANELS)
+        for i in range(panels):
+            self.status_model.add_panel(kinds[i % len(kinds)])
 
         # The add button
+        self.panel_kind_combo = QComboBox()
+        for kind, (title, _) in STATUS_PANELS.items():
+            self.panel_kind_combo.addItem(title, kind)
+        path_entry_layout.addWidget(self.panel_kind_combo, 0, 0)
         add_button = QPushButton("Add")
-        path_entry_layout.addWidget(add_button, 0, 0)
-
-        # create a scrollable widget
-        scroll_widget = QScrollArea()
-        scroll_widget.setWidgetResizable(True)
-        scroll_widget.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Maximum)
-        scroll_widget.setWidget(path_entry_content)
-        path_entry_layout.addWidget(scroll_widget, 1, 0)
+        add_button.clicked.connect(self.on_add_panel)
+        path_entry_layout.addWidget(add_button, 0, 1)
+
+        # create a scrollable list
+        self.status_view = StatusListView(self.status_model)
+        self.status_view.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        path_entry_layout.addWidget(self.status_view, 1, 0, 1, 2)
         left_layout.addWidget(path_entry_group)
 
         # =============== 2. Power Supply ===============
@@ -201,6 +135,14 @@ class RobotGUI(QMainWindow):
 
     # ============ 以下函数可按需实现实际逻辑 ============
 
+    def update_status_channels(self):
+        for (name, *_), value in zip(FAKE_STATUS_SPECS, self.fake_status.step().tolist()):
+            self.status_channels.publish(name, value)
+
+    def on_add_panel(self):
+        self.status_model.add_panel(self.panel_kind_combo.currentData())
+        self.status_view.scrollToBottom()
+
     def on_load_clicked(self):
         """点击Load按钮事件"""
         coords_text = self.path_input.text()
@@ -262,8 +204,11 @@ class RobotGUI(QMainWindow):
 
 
 def main():
-    app = QApplication(sys.argv)
-    gui = RobotGUI()
+    parser = argparse.ArgumentParser(description="Robot GUI")
+    parser.add_argument("--panels", type=int, default=6, help="status panels to start with")
+    args, qt_args = parser.parse_known_args()
+    app = QApplication(sys.argv[:1] + qt_args)
+    gui = RobotGUI(args.panels)
     gui.show()
     sys.exit(app.exec())
 
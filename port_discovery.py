@@ -0,0 +1,93 @@
+import os
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from serial import Serial, SerialException
+import serial.tools.list_ports
+
+from serial_protocol import transact
+
+# Harmless command for the handshake: the firmware does not know it, so it
+# only echoes it back followed by the "end" line.
+HANDSHAKE = "ping"
+
+# Identity (VID/PID/serial number) of the last board that answered
+CACHE_FILE = os.path.join(os.path.expanduser("~"), ".rover_port.json")
+
+
+def port_identity(port_info) -> dict:
+    return {"vid": port_info.vid, "pid": port_info.pid, "serial_number": port_info.serial_number}
+
+
+def load_cached_identity(cache_file: str = CACHE_FILE):
+    try:
+        with open(cache_file) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_cached_identity(identity: dict, cache_file: str = CACHE_FILE):
+    try:
+        with open(cache_file, "w") as f:
+            json.dump(identity, f)
+    except OSError:
+        pass  # the cache only makes reconnects faster
+
+
+def probe_port(device: str, baudrate: int = 115200, timeout: float = 0.5):
+    """
+    Do the handshake on one port.
+    :return: (score, latency) where score 0 means the firmware echoed the
+             handshake, 1 means some other reply ending in "end"; None if the
+             port did not answer.
+    """
+    try:
+        with Serial(port=device, baudrate=baudrate, timeout=.02) as ser:
+            start = time.monotonic()
+            lines = transact(ser, HANDSHAKE + "\n", timeout=timeout)
+            latency = time.monotonic() - start
+    except (SerialException, OSError, TimeoutError):
+        return None
+    score = 0 if lines == [HANDSHAKE.encode()] else 1
+    return score, latency
+
+
+def discover_port(baudrate: int = 115200, timeout: float = 0.5, cache_file: str = CACHE_FILE):
+    """
+    Find the rover controller among all serial ports.
+    Every port is probed at the same time, so this takes at most about one
+    handshake timeout. If the cached board answers, it is picked right away
+    without waiting for the other ports.
+    :return: Device name of the best port, or None if no port answered.
+    """
+    ports = serial.tools.list_ports.comports()
+    if not ports:
+        return None
+    cached = load_cached_identity(cache_file)
+
+    best = None  # (score, latency, port_info)
+    executor = ThreadPoolExecutor(max_workers=len(ports))
+    futures = {executor.submit(probe_port, p.device, baudrate, timeout): p for p in ports}
+    try:
+        for future in as_completed(futures, timeout=timeout + 0.2):
+            result = future.result()
+            if result is None:
+                continue
+            port_info = futures[future]
+            if result[0] == 0 and port_identity(port_info) == cached:
+                best = (*result, port_info)
+                break
+            if best is None or result < best[:2]:
+                best = (*result, port_info)
+    except FuturesTimeoutError:
+        pass  # ports that are still busy are too slow anyway
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    if best is None:
+        return None
+    port_info = best[2]
+    if port_identity(port_info) != cached:
+        save_cached_identity(port_identity(port_info), cache_file)
+    return port_info.device
@@ -0,0 +1,178 @@
+import numpy as np
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QRect, QEvent, pyqtSignal
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import (
+    QTableView, QStyledItemDelegate, QStyle, QStyleOptionButton, QApplication, QHeaderView
+)
+
+from rail_alarms import STATE_NAMES, OK, OFF
+
+COLUMNS = ["Voltage", "Specification", "Operation Voltage(V)", "Operation Current(mA)", "Status", "Control"]
+NAME, SPECIFICATION, VOLTAGE, CURRENT, STATUS, CONTROL = range(len(COLUMNS))
+
+# raw value of a cell (float for the measurements, alarm state for Status)
+ValueRole = Qt.ItemDataRole.UserRole
+
+STATUS_COLORS = {OK: QColor(170, 220, 170), OFF: QColor(200, 200, 200)}
+ALARM_COLOR = QColor(240, 150, 150)
+
+
+def changed_runs(changed):
+    """
+    (start, stop) of every run of consecutive True values in a boolean array.
+    """
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], changed, [False])).astype(np.int8)))
+    return zip(edges[::2], edges[1::2])
+
+
+class PowerSupplyModel(QAbstractTableModel):
+    """
+    The Power Supply table: one row per rail, backed by NumPy arrays instead
+    of one widget per cell. set_values() and set_states() compare with what
+    is shown (at display precision) and emit dataChanged only for the runs of
+    rows that actually changed, so the view repaints just those cells.
+    """
+    def __init__(self, names, specifications, parent=None):
+        """
+        :param names: Rail names, e.g. "3.3V".
+        :param specifications: What each rail powers.
+        """
+        super().__init__(parent)
+        self.names = list(names)
+        self.specifications = list(specifications)
+        n = len(self.names)
+        self.voltage = np.full(n, np.nan)
+        self.current = np.full(n, np.nan)
+        self.state = np.zeros(n, dtype=np.int8)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.names)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        row, column = index.row(), index.column()
+        if role == ValueRole:
+            if column == VOLTAGE:
+                return float(self.voltage[row])
+            if column == CURRENT:
+                return float(self.current[row])
+            if column == STATUS:
+                return int(self.state[row])
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == NAME:
+                return self.names[row]
+            if column == SPECIFICATION:
+                return self.specifications[row]
+            if column in (VOLTAGE, CURRENT):
+                value = self.voltage[row] if column == VOLTAGE else self.current[row]
+                return "--" if np.isnan(value) else f"{value:.2f}"
+            if column == STATUS:
+                return STATE_NAMES[self.state[row]]
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def set_values(self, voltages, currents):
+        """
+        Show new measurements (one voltage and one current per rail).
+        """
+        voltages = np.round(voltages, 2)
+        currents = np.round(currents, 2)
+        changed = (voltages != self.voltage) | (currents != self.current)
+        self.voltage[:] = voltages
+        self.current[:] = currents
+        for start, stop in changed_runs(changed):
+            self.dataChanged.emit(self.index(start, VOLTAGE), self.index(stop - 1, CURRENT))
+
+    def set_states(self, states, rails=None):
+        """
+        Show alarm states; only `rails` (all if None) are compared.
+        """
+        changed = np.zeros(len(self.state), dtype=bool)
+        rails = np.arange(len(self.state)) if rails is None else np.asarray(rails, dtype=np.int64)
+        changed[rails] = self.state[rails] != states[rails]
+        self.state[rails] = states[rails]
+        for start, stop in changed_runs(changed):
+            self.dataChanged.emit(self.index(start, STATUS), self.index(stop - 1, STATUS))
+
+
+class PowerSupplyDelegate(QStyledItemDelegate):
+    """
+    Paints the measurement, Status and Control cells directly: values as
+    plain text, Status on a colored background, and the ON/OFF buttons of
+    the Control column as styled button panels (no button widgets per row).
+    Clicking the left half of a Control cell asks for ON, the right half for OFF.
+    """
+    switch_clicked = pyqtSignal(int, bool)   # row, on
+
+    def paint(self, painter, option, index):
+        column = index.column()
+        if column == CONTROL:
+            self._paint_buttons(painter, option)
+            return
+        if column == STATUS:
+            state = index.data(ValueRole)
+            painter.fillRect(option.rect.adjusted(1, 1, -1, -1), STATUS_COLORS.get(state, ALARM_COLOR))
+        elif column not in (VOLTAGE, CURRENT):
+            super().paint(painter, option, index)
+            return
+        painter.drawText(option.rect, Qt.AlignmentFlag.AlignCenter, index.data())
+
+    def _paint_buttons(self, painter, option):
+        style = QApplication.style()
+        for rect, text in zip(self._button_rects(option.rect), ("ON", "OFF")):
+            button = QStyleOptionButton()
+            button.rect = rect
+            button.text = text
+            button.state = QStyle.StateFlag.State_Enabled | QStyle.StateFlag.State_Raised
+            style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter)
+
+    @staticmethod
+    def _button_rects(rect):
+        half = rect.width() // 2
+        return (QRect(rect.left() + 2, rect.top() + 2, half - 3, rect.height() - 4),
+                QRect(rect.left() + half + 1, rect.top() + 2, rect.width() - half - 3, rect.height() - 4))
+
+    def editorEvent(self, event, model, option, index):
+        if index.column() == CONTROL and event.type() == QEvent.Type.MouseButtonRelease:
+            on_rect, off_rect = self._button_rects(option.rect)
+            position = event.position().toPoint()
+            if on_rect.contains(position):
+                self.switch_clicked.emit(index.row(), True)
+            elif off_rect.contains(position):
+                self.switch_clicked.emit(index.row(), False)
+            return True
+        return super().editorEvent(event, model, option, index)
+
+
+class PowerSupplyTable(QTableView):
+    """
+    QTableView for a PowerSupplyModel with fixed row heights, so the view
+    only lays out and paints the visible rows however many rails there are.
+    """
+    def __init__(self, model: PowerSupplyModel, visible_rows: int = 12, parent=None):
+        super().__init__(parent)
+        self.setModel(model)
+        self.delegate = PowerSupplyDelegate(self)
+        self.setItemDelegate(self.delegate)
+        self.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.setSelectionMode(QTableView.SelectionMode.NoSelection)
+        self.verticalHeader().hide()
+        self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.verticalHeader().setDefaultSectionSize(26)
+        # column widths are measured once, not on every update
+        self.resizeColumnsToContents()
+        header = self.horizontalHeader()
+        header.setSectionResizeMode(SPECIFICATION, QHeaderView.ResizeMode.Stretch)
+        self.setColumnWidth(CONTROL, 110)
+        rows = min(model.rowCount(), visible_rows)
+        self.setMinimumHeight(header.sizeHint().height() + rows * 26 + 2 * self.frameWidth())
@@ -0,0 +1,136 @@
+import numpy as np
+
+# alarm states, in priority order
+OK = 0
+UNDERVOLTAGE = 1
+OVERVOLTAGE = 2
+OVERCURRENT = 3
+OFF = 4   # rail switched off, not checked
+
+STATE_NAMES = ["OK", "LOW V", "HIGH V", "OVERCURRENT", "OFF"]
+
+
+class RailAlarms:
+    """
+    Checks every rail's voltage and current against its alarm bands in one
+    NumPy pass per sample:
+        undervoltage  below nominal * (1 - tolerance)
+        overvoltage   above nominal * (1 + tolerance)
+        overcurrent   above max_current
+    A rail in alarm only returns to OK once it is `hysteresis` (share of the
+    band) inside that alarm's limit again; the other limits stay as they
+    are. The voltage band is nominal * tolerance, the current band is
+    max_current - nominal_current. A new state is only taken after it has
+    been seen on `debounce` consecutive samples, so noise around a limit does
+    not make the state flap. update() returns the rails whose state changed,
+    which is all a display has to repaint.
+    """
+    def __init__(self, nominal_voltage, tolerance, max_current, nominal_current=None,
+                 hysteresis: float = 0.2, debounce: int = 3):
+        """
+        Every argument but debounce is one value per rail (or a scalar).
+        :param nominal_voltage: Nominal voltage.
+        :param tolerance: Allowed relative deviation from nominal, e.g. 0.05 for +-5%.
+        :param max_current: Overcurrent limit.
+        :param nominal_current: Normal current, the low end of the current band
+                                (None: max_current * (1 - tolerance)).
+        :param hysteresis: Share of a limit's band the value has to come back by to clear.
+        :param debounce: Consecutive samples a new state has to hold before it is taken.
+        """
+        nominal = np.asarray(nominal_voltage, dtype=np.float64)
+        n = len(nominal)
+        tolerance = np.broadcast_to(np.asarray(tolerance, dtype=np.float64), n)
+        max_current = np.broadcast_to(np.asarray(max_current, dtype=np.float64), n)
+        hysteresis = np.broadcast_to(np.asarray(hysteresis, dtype=np.float64), n)
+        if nominal_current is None:
+            current_band = max_current * tolerance
+        else:
+            current_band = max_current - np.broadcast_to(np.asarray(nominal_current, dtype=np.float64), n)
+        band = nominal * tolerance
+        # limits for entering an alarm, and the tighter ones for leaving it
+        self.enter = (nominal - band, nominal + band, max_current.copy())
+        self.leave = (nominal - band * (1 - hysteresis), nominal + band * (1 - hysteresis),
+                      max_current - current_band * hysteresis)
+        self.debounce = debounce
+
+        self.state = np.zeros(n, dtype=np.int8)
+        self.enabled = np.ones(n, dtype=bool)
+        self._pending = np.zeros(n, dtype=np.int8)    # candidate state being debounced
+        self._count = np.zeros(n, dtype=np.int32)     # samples the candidate has held
+
+    def __len__(self):
+        return len(self.state)
+
+    def set_enabled(self, rail: int, enabled: bool):
+        """
+        Switch checking of one rail on or off (a rail that is off shows OFF).
+        """
+        self.enabled[rail] = enabled
+        self.state[rail] = OK if enabled else OFF
+        self._count[rail] = 0
+
+    def classify(self, voltage, current, state=None):
+        """
+        Raw alarm state of every rail for one sample (or N x rails samples),
+        using the leave limit of the alarm each rail is in in `state`.
+        """
+        if state is None:
+            state = self.state
+        low = np.where(state == UNDERVOLTAGE, self.leave[0], self.enter[0])
+        high = np.where(state == OVERVOLTAGE, self.leave[1], self.enter[1])
+        limit = np.where(state == OVERCURRENT, self.leave[2], self.enter[2])
+        raw = np.where(current > limit, OVERCURRENT,
+                       np.where(voltage < low, UNDERVOLTAGE,
+                                np.where(voltage > high, OVERVOLTAGE, OK)))
+        return np.where(self.enabled, raw, OFF).astype(np.int8)
+
+    def update(self, voltage, current):
+        """
+        Check one sample (one voltage and one current per rail).
+        :return: Indices of the rails whose state changed.
+        """
+        candidate = self.classify(voltage, current)
+        differs = candidate != self.state
+        same = differs & (candidate == self._pending)
+        self._count = np.where(same, self._count + 1, np.where(differs, 1, 0))
+        self._pending = candidate
+        changed = np.flatnonzero(self._count >= self.debounce)
+        if len(changed):
+            self.state[changed] = candidate[changed]
+            self._count[changed] = 0
+        return changed
+
+    def update_many(self, voltages, currents):
+        """
+        Check a batch of samples (N x rails each), oldest first, with the same
+        result as calling update() for every sample. While no rail changes
+        state the candidate states of a whole chunk are computed at once and
+        the debounce counters become run lengths along the time axis, so the
+        Python loop only runs once per chunk or state change, not per sample.
+        :return: Indices of the rails whose state changed.
+        """
+        before = self.state.copy()
+        pos, chunk = 0, 16
+        while pos < len(voltages):
+            candidate = self.classify(voltages[pos:pos + chunk], currents[pos:pos + chunk])
+            rows = np.arange(len(candidate))[:, None]
+            previous = np.concatenate([self._pending[None], candidate[:-1]])
+            # index where the current run of equal candidates started, -1 if
+            # it started before this chunk and is already counted in _count
+            run_start = np.maximum.accumulate(np.where(candidate != previous, rows, -1), axis=0)
+            run_length = np.where(run_start >= 0, rows - run_start, rows + self._count) + 1
+            differs = candidate != self.state
+            trigger = differs & (run_length >= self.debounce)
+            hits = np.flatnonzero(trigger.any(axis=1))
+            last = hits[0] if len(hits) else len(candidate) - 1
+            self._pending = candidate[last]
+            self._count = np.where(differs[last], run_length[last], 0).astype(np.int32)
+            if len(hits):
+                changed = trigger[last]
+                self.state[changed] = candidate[last][changed]
+                self._count[changed] = 0
+                chunk = 16
+            else:
+                chunk = min(chunk * 2, 4096)
+            pos += last + 1
+        return np.flatnonzero(self.state != before)
@@ -0,0 +1,110 @@
+"""
+Power Supply rails, declared in rails.json instead of code.
+
+Every rail has a name, a serial command id, a description, its nominal
+voltage and current, alarm bands (tolerance, max_current) and the noise of
+its fake channels. "groups" name sets of rails and "operations" are the
+emergency buttons built from them: {"keep": group} switches off every rail
+outside the group, {"off": group} switches off the rails in it.
+
+The file is parsed once into RailConfig: parallel lists and NumPy arrays
+indexed by rail number, which is also the row in the Power Supply table and
+the column in the voltage/current telemetry channels.
+"""
+
+import os
+import json
+
+import numpy as np
+
+RAILS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rails.json")
+
+REQUIRED_FIELDS = ("name", "id", "description", "voltage", "current", "tolerance", "max_current")
+
+
+class RailConfig:
+    """
+    All rails, array-indexed by rail number.
+    """
+    def __init__(self, rails, commands, groups=None, operations=None):
+        """
+        :param rails: List of rail dicts (see rails.json).
+        :param commands: {"on": template, "off": template} with an {id} field.
+        :param groups: Group name -> list of rail names.
+        :param operations: List of {"label", "keep" or "off"}.
+        """
+        for rail in rails:
+            missing = [field for field in REQUIRED_FIELDS if field not in rail]
+            if missing:
+                raise ValueError(f"rail {rail.get('name', '?')}: missing {', '.join(missing)}")
+        self.names = [rail["name"] for rail in rails]
+        self.ids = [rail["id"] for rail in rails]
+        self.descriptions = [rail["description"] for rail in rails]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        if len(self.index) != len(self.names):
+            raise ValueError("rail names must be unique")
+        self.nominal_voltage = np.array([rail["voltage"] for rail in rails], dtype=np.float64)
+        self.nominal_current = np.array([rail["current"] for rail in rails], dtype=np.float64)
+        self.tolerance = np.array([rail["tolerance"] for rail in rails], dtype=np.float64)
+        self.max_current = np.array([rail["max_current"] for rail in rails], dtype=np.float64)
+        self.noise = np.array([rail.get("noise", [0.0, 0.0]) for rail in rails], dtype=np.float64)
+        self.commands = commands
+
+        self.groups = {name: self.mask(members) for name, members in (groups or {}).items()}
+        # (label, rails to switch off)
+        self.operations = []
+        for operation in operations or []:
+            label = operation.get("label", "?")
+            if "label" not in operation or ("keep" in operation) == ("off" in operation):
+                raise ValueError(f"operation {label}: needs a label and one of keep, off")
+            group = operation.get("keep", operation.get("off"))
+            if group not in self.groups:
+                raise ValueError(f"operation {label}: unknown group {group}")
+            off = ~self.groups[group] if "keep" in operation else self.groups[group]
+            self.operations.append((label, off))
+
+    @classmethod
+    def load(cls, path: str = RAILS_FILE):
+        with open(path) as f:
+            config = json.load(f)
+        return cls(config["rails"], config["commands"], config.get("groups"), config.get("operations"))
+
+    def __len__(self):
+        return len(self.names)
+
+    def mask(self, names) -> np.ndarray:
+        """
+        Boolean array, True for the named rails.
+        """
+        mask = np.zeros(len(self), dtype=bool)
+        for name in names:
+            if name not in self.index:
+                raise ValueError(f"unknown rail {name}")
+            mask[self.index[name]] = True
+        return mask
+
+    def command(self, rail: int, on: bool) -> str:
+        return self.commands["on" if on else "off"].format(id=self.ids[rail])
+
+    def channel_names(self):
+        """
+        Telemetry channel names: all voltages, then all currents.
+        """
+        return [f"{name} voltage" for name in self.names] + [f"{name} current" for name in self.names]
+
+    def split(self, values):
+        """
+        (voltages, currents) of one sample or of N x channels samples.
+        :raises ValueError: If the samples do not have one voltage and one current per rail.
+        """
+        n = len(self)
+        if values.shape[-1] != 2 * n:
+            raise ValueError(f"samples have {values.shape[-1]} channels, {n} rails need {2 * n}")
+        return values[..., :n], values[..., n:]
+
+    def fake_specs(self):
+        """
+        FakeChannelBank.from_specs() tuples for the voltage and current channels.
+        """
+        return [(v, v, std) for v, std in zip(self.nominal_voltage, self.noise[:, 0])] + \
+               [(i, i, std) for i, std in zip(self.nominal_current, self.noise[:, 1])]
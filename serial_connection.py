@@ -0,0 +1,107 @@
+import time
+from serial import Serial, SerialException
+
+from port_discovery import discover_port
+
+DISCONNECTED = "disconnected"
+CONNECTING = "connecting"
+CONNECTED = "connected"
+
+
+class SerialConnection:
+    """
+    Lazily opened serial port with reconnect backoff.
+    Nothing is opened until open() is first called. After a failed open or a
+    dropped link, the next attempt is delayed by an exponential backoff
+    (min_backoff, doubled up to max_backoff); retry_in() tells the owner when
+    to try again. Not thread safe: use it only from the thread that owns the port.
+    """
+    def __init__(self, port: str = None, baudrate: int = 115200, timeout: float = .1,
+                 min_backoff: float = 0.5, max_backoff: float = 30.0, on_state_changed=None,
+                 stats=None):
+        """
+        :param port: Device name, or None to look for the board at open time (discover_port).
+        :param on_state_changed: Called with the new state string.
+        :param stats: Optional link_stats.LinkStats to count reconnects.
+        """
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.on_state_changed = on_state_changed
+        self.stats = stats
+
+        self.serial = None
+        self.device = None
+        self.state = DISCONNECTED
+        self.last_error = ""
+        self._ever_connected = False
+        self._backoff = min_backoff
+        self._next_attempt = None  # None until the port is first wanted
+
+    def _set_state(self, state):
+        if state != self.state:
+            self.state = state
+            if self.on_state_changed is not None:
+                self.on_state_changed(state)
+
+    def _schedule_retry(self, error):
+        self.last_error = str(error)
+        self._next_attempt = time.monotonic() + self._backoff
+        self._backoff = min(self._backoff * 2, self.max_backoff)
+        self._set_state(DISCONNECTED)
+
+    def open(self):
+        """
+        Return the open port, opening it if the backoff allows.
+        :return: serial.Serial, or None if not connected (yet).
+        """
+        if self.serial is not None:
+            return self.serial
+        if self._next_attempt is not None and time.monotonic() < self._next_attempt:
+            return None
+
+        self._set_state(CONNECTING)
+        device = self.port or discover_port(self.baudrate)
+        try:
+            if device is None:
+                raise SerialException("no rover controller found")
+            self.serial = Serial(port=device, baudrate=self.baudrate, timeout=self.timeout)
+        except (SerialException, OSError) as e:
+            self._schedule_retry(e)
+            return None
+
+        if self._ever_connected and self.stats is not None:
+            self.stats.record_reconnect()
+        self._ever_connected = True
+        self.device = device
+        self._backoff = self.min_backoff
+        self._next_attempt = 0.0
+        self._set_state(CONNECTED)
+        return self.serial
+
+    def lost(self, error):
+        """
+        Report a broken link; the port is closed and reopened after the backoff.
+        """
+        self.close()
+        self._schedule_retry(error)
+
+    def retry_in(self):
+        """
+        Seconds until the next reconnect attempt, or None if none is due
+        (connected, or never used).
+        """
+        if self.serial is not None or self._next_attempt is None:
+            return None
+        return max(0.0, self._next_attempt - time.monotonic())
+
+    def close(self):
+        if self.serial is not None:
+            try:
+                self.serial.close()
+            except (SerialException, OSError):
+                pass
+            self.serial = None
+        self._set_state(DISCONNECTED)
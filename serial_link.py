@@ -0,0 +1,153 @@
+import queue
+from functools import partial
+from concurrent.futures import Future
+from serial import SerialException
+
+from command_coalescer import CommandCoalescer
+from link_stats import LinkStats
+from serial_connection import SerialConnection
+from serial_protocol import PipelinedSender
+
+# queue marker: a coalesced command is waiting in the CommandCoalescer
+_COALESCED = object()
+
+
+class SerialLink:
+    """
+    The serial command loop, without Qt: run() owns the port and sends the
+    queued commands one writer at a time, so it can be run by SerialWorker
+    in the GUI or by a plain thread in the telemetry hub.
+    Up to `window` commands are kept in flight, see PipelinedSender.
+    The port is opened on the first command and reopened with backoff after
+    the link drops, see SerialConnection.
+    Timing and traffic are counted in `stats` (link_stats.LinkStats).
+    Commands sent with send_latest() are coalesced per target, see CommandCoalescer.
+    The callbacks are called from the thread that runs run().
+    """
+    def __init__(self, port: str = None, baudrate: int = 115200, timeout: float = .1,
+                 response_timeout: float = 1.0, window: int = 1,
+                 on_reply=None, on_error=None, on_state_changed=None):
+        """
+        :param port: Device name, or None to look for the board.
+        :param on_reply: Called with (command, reply lines).
+        :param on_error: Called with (command, error message).
+        :param on_state_changed: Called with the connection state.
+        """
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.response_timeout = response_timeout
+        self.window = window
+        self.on_reply = on_reply
+        self.on_error = on_error
+        self.on_state_changed = on_state_changed
+        self.commands = queue.Queue()
+        self.stats = LinkStats()
+        self.coalescer = CommandCoalescer()
+        self._running = True
+
+    def send(self, command: str, done=None):
+        """
+        Queue a command. Never blocks.
+        :param done: Called with the reply future instead of on_reply/on_error.
+        """
+        self.commands.put((command, done))
+
+    def send_latest(self, target: str, command: str):
+        """
+        Ask for `command` to be the state of `target`. Unsent older commands
+        for the same target are dropped. Never blocks.
+        """
+        if self.coalescer.put(target, command):
+            self.commands.put(_COALESCED)  # wake up the queue
+
+    def stop(self):
+        """
+        Ask run() to finish.
+        """
+        self._running = False
+        self.commands.put(None)  # wake up the queue
+
+    def run(self):
+        connection = SerialConnection(self.port, self.baudrate, self.timeout,
+                                      on_state_changed=self.on_state_changed, stats=self.stats)
+        sender = None
+
+        while self._running:
+            # sleep on the queue while idle, or until the next reconnect attempt
+            if (sender is not None and sender.busy()) or self.coalescer.ready():
+                wait = 0
+            else:
+                wait = connection.retry_in()
+            commands = []
+            try:
+                commands.append(self.commands.get(timeout=wait))
+                while True:
+                    commands.append(self.commands.get_nowait())
+            except queue.Empty:
+                pass
+
+            if sender is None and self._running and (commands or connection.retry_in() == 0):
+                serial_port = connection.open()
+                if serial_port is not None:
+                    sender = PipelinedSender(serial_port, self.window, self.response_timeout,
+                                             self.stats)
+
+            for item in commands:
+                if item is None:
+                    self._running = False
+                    break
+                if item is _COALESCED:
+                    continue
+                command, done = item
+                done = done or partial(self._finish, command)
+                if sender is None:
+                    future = _failed(ConnectionError("Not connected"))
+                    done(future)
+                    continue
+                future = sender.submit(command)
+                future.add_done_callback(done)
+
+            for target, command in (self.coalescer.take() if self._running else []):
+                if sender is None:
+                    self.coalescer.acknowledge(target, command, False)
+                    self._emit(self.on_error, command, "Not connected")
+                    continue
+                future = sender.submit(command)
+                future.add_done_callback(partial(self._finish_latest, target, command))
+
+            if sender is None or not self._running:
+                continue
+            try:
+                sender.pump()
+            except (SerialException, OSError) as e:
+                sender.fail_all(ConnectionError(str(e)))
+                sender = None
+                connection.lost(e)
+                self.coalescer.forget()
+
+        if sender is not None:
+            sender.fail_all(ConnectionError("serial link stopped"))
+        connection.close()
+
+    @staticmethod
+    def _emit(callback, *args):
+        if callback is not None:
+            callback(*args)
+
+    def _finish(self, command, future):
+        error = future.exception()
+        if error is not None:
+            self._emit(self.on_error, command, str(error))
+        else:
+            self._emit(self.on_reply, command, future.result())
+
+    def _finish_latest(self, target, command, future):
+        self.coalescer.acknowledge(target, command, future.exception() is None)
+        self._finish(command, future)
+
+
+def _failed(error):
+    future = Future()
+    future.set_exception(error)
+    return future
@@ -0,0 +1,250 @@
+import time
+import threading
+from collections import deque
+from concurrent.futures import Future
+
+# The firmware (fadsfasd.c) answers every command with the echo of the
+# command, an optional reply line ("green", "red", "blue", "off") and then
+# this terminator line.
+END_LINE = b"end"
+
+
+class ResponseParser:
+    """
+    Incremental parser for the firmware replies.
+    Bytes can be fed in any chunk size; complete lines are collected until the
+    "end" line arrives, then the collected lines are returned as one response.
+    Note: a command that is literally "end" is echoed as a second terminator.
+    """
+    def __init__(self, end_line: bytes = END_LINE):
+        self.end_line = end_line
+        self._buffer = bytearray()
+        self._lines = []
+
+    def feed(self, data: bytes) -> list:
+        """
+        Add received bytes.
+        :param data: Raw bytes from the serial port.
+        :return: List of finished responses, each a list of lines (bytes, without "\\r\\n").
+        """
+        self._buffer += data
+        responses = []
+        start = 0
+        while True:
+            newline = self._buffer.find(b"\n", start)
+            if newline < 0:
+                break
+            line = bytes(self._buffer[start:newline]).rstrip(b"\r")
+            start = newline + 1
+            if line == self.end_line:
+                responses.append(self._lines)
+                self._lines = []
+            elif line:
+                self._lines.append(line)
+        del self._buffer[:start]
+        return responses
+
+    def reset(self):
+        """
+        Drop any partial line or response, e.g. after a timeout.
+        """
+        self._buffer.clear()
+        self._lines = []
+
+
+def command_echo(command: str) -> bytes:
+    """
+    The first line of the firmware's response to `command`: the message as
+    UART_Receive_Message stored it (up to the first "\\r", "\\n" or "\\0").
+    """
+    message = bytes(command, 'utf-8')
+    for terminator in b"\r\n\0":
+        message = message.split(bytes([terminator]))[0]
+    return message
+
+
+def read_available(ser) -> bytes:
+    """
+    Read everything the port already holds in one call. If nothing is waiting,
+    wait for a single byte (bounded by the port timeout) instead of spinning.
+    """
+    return ser.read(ser.in_waiting or 1)
+
+
+def transact(ser, command: str, parser: ResponseParser = None, timeout: float = 1.0) -> list:
+    """
+    Send one command and read until its "end" line.
+    Returns as soon as the terminator arrives, so the round trip is only as long
+    as the link and the firmware need.
+    :param ser: Open serial.Serial.
+    :param command: Command text, including the trailing "\\n".
+    :param parser: Parser to reuse, a new one is made if None.
+    :param timeout: Seconds to wait for the whole response.
+    :return: Reply lines (bytes) before the "end" line.
+    :raises TimeoutError: If no complete response arrived in time.
+    """
+    if parser is None:
+        parser = ResponseParser()
+    # throw away leftovers of an earlier, timed out command; replies that
+    # are still on their way are skipped below by their echo
+    ser.reset_input_buffer()
+    parser.reset()
+
+    echo = command_echo(command)
+    ser.write(bytes(command, 'utf-8'))
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        for lines in parser.feed(read_available(ser)):
+            if lines[:1] == [echo]:
+                return lines
+    raise TimeoutError(f"no response to {command.strip()!r} within {timeout}s")
+
+
+class PipelinedSender:
+    """
+    Keeps several commands in flight on one serial port.
+    Commands are written back to back (up to `window` unanswered at a time),
+    the "end" line splits the input into responses and each response is
+    matched to its command by its first line, the echo of the command.
+    Each submit() returns a Future that resolves to the reply lines.
+
+    A command that times out is failed and remembered for one more timeout:
+    its reply may still come, and is then dropped instead of being taken for
+    the reply of the next command. A late reply with the echo of a command in
+    flight is given to that command, as it is the same reply, so a reply
+    lost for good does not make every repeat of its command fail. A response
+    whose echo skips commands in flight means their replies were lost on the
+    line; they are failed at once.
+
+    submit() may be called from any thread; pump() must only be called by the
+    thread that owns the port.
+
+    Note: the firmware reads the UART by polling, so bytes that arrive while it
+    is still transmitting a reply can be lost on real hardware. Use window=1
+    if a board drops commands; that still has no fixed sleep per command.
+    """
+    def __init__(self, ser, window: int = 4, timeout: float = 1.0, stats=None):
+        """
+        :param ser: Open serial.Serial.
+        :param window: Maximum number of commands waiting for a response.
+        :param timeout: Seconds the oldest command may wait for its response.
+        :param stats: Optional link_stats.LinkStats to record latency and traffic.
+        """
+        self.ser = ser
+        self.window = window
+        self.timeout = timeout
+        self.stats = stats
+        self.parser = ResponseParser()
+        self._pending = deque()    # (command, future), not written yet
+        self._in_flight = deque()  # (command, future, time written)
+        self._abandoned = deque()  # (echo, deadline) of timed out commands whose replies may still come
+        self._last_heard = time.monotonic()  # last time bytes arrived or a command was abandoned
+        self._lock = threading.Lock()
+
+    def submit(self, command: str) -> Future:
+        """
+        Queue a command (including the trailing "\n").
+        :return: Future resolving to the reply lines, or failing with TimeoutError.
+        """
+        future = Future()
+        with self._lock:
+            self._pending.append((command, future))
+        return future
+
+    def busy(self) -> bool:
+        """
+        True while any command is queued or waiting for its response.
+        """
+        return bool(self._pending or self._in_flight)
+
+    def pump(self):
+        """
+        Write queued commands while the window allows, read what has arrived and
+        resolve the matching futures. Waits at most one port timeout.
+        """
+        out = bytearray()
+        now = time.monotonic()
+        if not self._in_flight and now - self._last_heard > self.timeout:
+            self._abandoned.clear()  # quiet for a whole timeout, nothing late is coming
+        with self._lock:
+            while self._pending and len(self._in_flight) < self.window:
+                command, future = self._pending.popleft()
+                if not future.set_running_or_notify_cancel():
+                    continue  # cancelled before it was sent
+                out += bytes(command, 'utf-8')
+                self._in_flight.append((command, future, now))
+        if out:
+            self.ser.write(out)
+            if self.stats is not None:
+                self.stats.record_bytes(sent=len(out))
+        if not self._in_flight:
+            return
+
+        data = read_available(self.ser)
+        now = time.monotonic()
+        if data:
+            self._last_heard = now
+        if self.stats is not None:
+            self.stats.record_bytes(received=len(data))
+        for lines in self.parser.feed(data):
+            self._match(lines, now)
+
+        while self._abandoned and self._abandoned[0][1] < now:
+            self._abandoned.popleft()
+        while self._in_flight and now - self._in_flight[0][2] > self.timeout:
+            command, future, sent = self._in_flight.popleft()
+            self._abandoned.append((command_echo(command), now + self.timeout))
+            self._last_heard = now
+            self._fail(command, future, f"no response to {command.strip()!r} within {self.timeout}s")
+
+    def _match(self, lines, now):
+        echo = lines[0] if lines else b""
+        for position, (command, future, sent) in enumerate(self._in_flight):
+            if command_echo(command) == echo:
+                break
+        else:
+            position = None
+        # late replies come in the order the commands were sent
+        while self._abandoned:
+            late, deadline = self._abandoned.popleft()
+            if late == echo and deadline >= now:
+                if position != 0:
+                    return
+                break  # the same command is next in flight and gets the same reply
+        if position is None:
+            return  # nobody asked for this response
+        for _ in range(position):
+            lost, lost_future, _ = self._in_flight.popleft()
+            self._fail(lost, lost_future, f"reply to {lost.strip()!r} was lost")
+        command, future, sent = self._in_flight.popleft()
+        if self.stats is not None:
+            self.stats.record_latency(now - sent)
+        future.set_result(lines)
+
+    def _fail(self, command, future, message):
+        if self.stats is not None:
+            self.stats.record_timeouts(1)
+        future.set_exception(TimeoutError(message))
+
+    def fail_all(self, error: Exception):
+        """
+        Fail every queued and in-flight command, e.g. when the port is lost.
+        """
+        with self._lock:
+            pending = list(self._pending)
+            self._pending.clear()
+        for command, future in pending:
+            if future.set_running_or_notify_cancel():
+                future.set_exception(error)
+        while self._in_flight:
+            command, future, sent = self._in_flight.popleft()
+            future.set_exception(error)
+        self._abandoned.clear()
+        self.parser.reset()
+
+    def drain(self):
+        """
+        Pump until every submitted command is answered or has timed out.
+        """
+        while self.busy():
+            self.pump()
@@ -0,0 +1,55 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from serial_link import SerialLink
+
+
+class SerialWorker(QThread):
+    """
+    Background thread that owns the serial port.
+    The GUI puts commands on a queue with send(), the worker does the blocking
+    write/read and hands the reply back through the reply_received signal, so
+    the Qt event loop never waits on the link.
+    The command loop itself is serial_link.SerialLink: up to `window`
+    commands in flight, lazy open with reconnect backoff, link statistics in
+    `stats`, and commands sent with send_latest() coalesced per target.
+    """
+    reply_received = pyqtSignal(str, list)    # command, reply lines
+    error_occurred = pyqtSignal(str, str)     # command, error message
+    state_changed = pyqtSignal(str)           # connection state
+
+    def __init__(self, port: str = None, baudrate: int = 115200, timeout: float = .1,
+                 response_timeout: float = 1.0, window: int = 1):
+        """
+        :param port: Device name, or None to look for the board.
+        """
+        super().__init__()
+        # the signals are emitted in the worker thread and queued to the GUI thread
+        self.link = SerialLink(port, baudrate, timeout, response_timeout, window,
+                               on_reply=self.reply_received.emit,
+                               on_error=self.error_occurred.emit,
+                               on_state_changed=self.state_changed.emit)
+        self.stats = self.link.stats
+        self.coalescer = self.link.coalescer
+
+    def send(self, command: str):
+        """
+        Queue a command for the worker. Never blocks.
+        """
+        self.link.send(command)
+
+    def send_latest(self, target: str, command: str):
+        """
+        Ask for `command` to be the state of `target`. Unsent older commands
+        for the same target are dropped. Never blocks.
+        """
+        self.link.send_latest(target, command)
+
+    def stop(self):
+        """
+        Ask the worker to finish and wait for it.
+        """
+        self.link.stop()
+        self.wait()
+
+    def run(self):
+        self.link.run()
@@ -0,0 +1,36 @@
+class StatusChannels:
+    """
+    Latest value of every named status channel (e.g. "battery.voltage") and
+    the callbacks currently showing it.
+    publish() stores the value and calls only the callbacks subscribed to
+    that channel, so a channel nobody shows costs one dict assignment.
+    Any number of callbacks can subscribe to the same channel; a new
+    subscriber gets the latest value right away.
+    """
+    def __init__(self):
+        self.values = {}
+        self._subscribers = {}   # channel name -> list of callbacks
+
+    def publish(self, name: str, value):
+        self.values[name] = value
+        # callbacks may (un)subscribe while they run, e.g. pooled panels
+        for callback in tuple(self._subscribers.get(name, ())):
+            callback(name, value)
+
+    def subscribe(self, name: str, callback):
+        """
+        :param callback: Called with (name, value) on every publish of the channel.
+        """
+        self._subscribers.setdefault(name, []).append(callback)
+        if name in self.values:
+            callback(name, self.values[name])
+
+    def unsubscribe(self, name: str, callback):
+        subscribers = self._subscribers.get(name, [])
+        if callback in subscribers:
+            subscribers.remove(callback)
+            if not subscribers:
+                del self._subscribers[name]
+
+    def subscriber_count(self, name: str) -> int:
+        return len(self._subscribers.get(name, ()))
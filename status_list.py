@@ -0,0 +1,210 @@
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize, QTimer, QEvent, pyqtSignal
+from PyQt6.QtGui import QFont, QPalette
+from PyQt6.QtWidgets import (
+    QListView, QStyledItemDelegate, QStyle, QStyleOptionButton, QApplication
+)
+
+# status panel kinds: title and (caption, channel name, format) per row
+STATUS_PANELS = {
+    "battery": ("Battery Status", [
+        ("Battery Status", "battery.state", "{}"),
+        ("Voltage", "battery.voltage", "{:.1f}V"),
+        ("Current", "battery.current", "{:.1f}A"),
+        ("Temperature", "battery.temperature", "{:.0f}°C"),
+    ]),
+    "motor": ("Motor Status", [
+        ("Motor Status", "motor.state", "{}"),
+        ("Speed", "motor.speed", "{:.0f} RPM"),
+        ("Torque", "motor.torque", "{:.0f} Nm"),
+        ("Temperature", "motor.temperature", "{:.0f}°C"),
+    ]),
+    "led": ("LED Status", [
+        ("LED Status", "led.state", "{}"),
+        ("Color", "led.color", "{}"),
+    ]),
+}
+
+# kinds of panel showing each channel
+PANEL_KINDS_BY_CHANNEL = {}
+for kind, (_, rows) in STATUS_PANELS.items():
+    for _, name, _ in rows:
+        PANEL_KINDS_BY_CHANNEL.setdefault(name, set()).add(kind)
+
+# (caption, value text) of every row of a panel
+RowsRole = Qt.ItemDataRole.UserRole
+# panel kind, a key of STATUS_PANELS
+KindRole = Qt.ItemDataRole.UserRole + 1
+
+# changes are gathered for this long and repainted together
+FLUSH_INTERVAL_MS = 50
+
+
+class StatusListModel(QAbstractListModel):
+    """
+    The status panels as one list model instead of one group box per panel.
+    A panel is only its kind; its values are read from the StatusChannels
+    when the view paints it, so panels scrolled out of view cost nothing.
+    The model subscribes once per channel (not per panel) and marks the
+    kinds of panel showing a published channel; every FLUSH_INTERVAL_MS one
+    dataChanged over the panels of the marked kinds is emitted, and the
+    view repaints only the ones on screen.
+    """
+    def __init__(self, channels, parent=None):
+        """
+        :param channels: StatusChannels the panels show.
+        """
+        super().__init__(parent)
+        self.channels = channels
+        self.kinds = []             # kind per row
+        self._dirty_kinds = set()   # kinds showing a channel published since the last flush
+        self._panel_counts = {}     # channel name -> panels showing it
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(FLUSH_INTERVAL_MS)
+        self.flush_timer.timeout.connect(self.flush)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.kinds)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        kind = self.kinds[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return STATUS_PANELS[kind][0]
+        if role == KindRole:
+            return kind
+        if role == RowsRole:
+            values = self.channels.values
+            return [(caption, "--" if name not in values else value_format.format(values[name]))
+                    for caption, name, value_format in STATUS_PANELS[kind][1]]
+        return None
+
+    def add_panel(self, kind: str):
+        """
+        Appends a panel of one of the STATUS_PANELS kinds.
+        """
+        row = len(self.kinds)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.kinds.append(kind)
+        self.endInsertRows()
+        for _, name, _ in STATUS_PANELS[kind][1]:
+            if name not in self._panel_counts:
+                self._panel_counts[name] = 0
+                self.channels.subscribe(name, self._published)
+            self._panel_counts[name] += 1
+
+    def remove_panel(self, row: int):
+        kind = self.kinds[row]
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.kinds[row]
+        self.endRemoveRows()
+        for _, name, _ in STATUS_PANELS[kind][1]:
+            self._panel_counts[name] -= 1
+            if not self._panel_counts[name]:
+                del self._panel_counts[name]
+                self.channels.unsubscribe(name, self._published)
+
+    def _published(self, name, value):
+        self._dirty_kinds |= PANEL_KINDS_BY_CHANNEL[name]
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def flush(self):
+        """
+        One dataChanged from the first to the last panel of a marked kind.
+        """
+        dirty_kinds, self._dirty_kinds = self._dirty_kinds, set()
+        rows = [row for row, kind in enumerate(self.kinds) if kind in dirty_kinds]
+        if rows:
+            self.dataChanged.emit(self.index(rows[0]), self.index(rows[-1]), [RowsRole])
+
+
+class StatusPanelDelegate(QStyledItemDelegate):
+    """
+    Paints a status panel like the old group box: a frame with the title,
+    an "x" button and one caption/value line per row. Nothing is a widget,
+    so any number of panels costs the same to scroll. Clicking the "x"
+    emits close_clicked with the panel's row.
+    """
+    close_clicked = pyqtSignal(int)   # row
+
+    MARGIN = 6
+    BUTTON_SIZE = 20
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._sizes = {}   # kind -> size hint, panels of one kind are all alike
+
+    def sizeHint(self, option, index):
+        kind = index.data(KindRole)
+        if kind not in self._sizes:
+            line = option.fontMetrics.height() + 4
+            rows = len(STATUS_PANELS[kind][1])
+            self._sizes[kind] = QSize(200, 2 * self.MARGIN + max(line, self.BUTTON_SIZE) + rows * line)
+        return self._sizes[kind]
+
+    def paint(self, painter, option, index):
+        rect = option.rect.adjusted(2, 2, -2, -2)
+        # a plain rectangle, the style's group box frame costs more than the text
+        painter.save()
+        painter.setPen(option.palette.color(QPalette.ColorRole.Mid))
+        painter.drawRect(rect.adjusted(0, 0, -1, -1))
+
+        line = option.fontMetrics.height() + 4
+        top = rect.top() + self.MARGIN
+        left = rect.left() + self.MARGIN
+        width = rect.width() - 2 * self.MARGIN
+        title_height = max(line, self.BUTTON_SIZE)
+
+        painter.setPen(option.palette.color(QPalette.ColorRole.Text))
+        font = QFont(option.font)
+        font.setBold(True)
+        painter.setFont(font)
+        painter.drawText(QRect(left, top, width - self.BUTTON_SIZE, title_height),
+                         Qt.AlignmentFlag.AlignVCenter, index.data())
+        painter.restore()
+
+        button = QStyleOptionButton()
+        button.rect = self._button_rect(option.rect)
+        button.text = "x"
+        button.state = QStyle.StateFlag.State_Enabled | QStyle.StateFlag.State_Raised
+        QApplication.style().drawControl(QStyle.ControlElement.CE_PushButton, button, painter)
+
+        # caption and value columns share the width, like the old grid layout
+        half = width // 2
+        y = top + title_height
+        for caption, text in index.data(RowsRole):
+            painter.drawText(QRect(left, y, half, line), Qt.AlignmentFlag.AlignVCenter, caption)
+            painter.drawText(QRect(left + half, y, width - half, line), Qt.AlignmentFlag.AlignVCenter, text)
+            y += line
+
+    def _button_rect(self, rect):
+        rect = rect.adjusted(2, 2, -2, -2)
+        return QRect(rect.right() - self.MARGIN - self.BUTTON_SIZE, rect.top() + self.MARGIN,
+                     self.BUTTON_SIZE, self.BUTTON_SIZE)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseButtonRelease:
+            if self._button_rect(option.rect).contains(event.position().toPoint()):
+                self.close_clicked.emit(index.row())
+                return True
+        return super().editorEvent(event, model, option, index)
+
+
+class StatusListView(QListView):
+    """
+    Scrolling list of status panels: only the panels in view are laid out
+    and painted, however many there are. The "x" of a panel removes it from
+    the model.
+    """
+    def __init__(self, model: StatusListModel, parent=None):
+        super().__init__(parent)
+        self.setModel(model)
+        self.delegate = StatusPanelDelegate(self)
+        self.setItemDelegate(self.delegate)
+        self.delegate.close_clicked.connect(model.remove_panel)
+        self.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        self.setSelectionMode(QListView.SelectionMode.NoSelection)
+        self.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        # lay out big models in batches instead of all rows at once
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setBatchSize(100)
@@ -0,0 +1,93 @@
+import math
+
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+
+from downsample import minmax
+
+
+class StripChartCanvas(FigureCanvas):
+    """
+    Live strip charts for several channels in one Matplotlib canvas.
+    The axes, ticks and labels are drawn once and cached as a background;
+    every update only restores that background and redraws the line artists
+    (blitting), so the cost per frame depends on the number of points in the
+    visible window, not on the length of the history. The x axis is the time
+    relative to now, so the background stays valid while the lines scroll.
+    Windows with more than two points per pixel are reduced with a min/max
+    envelope first, so spikes stay visible and the cost stays flat.
+    """
+    def __init__(self, titles, y_ranges, span: float = 60.0, columns: int = 2,
+                 parent=None, width=8, height=6, dpi=100):
+        """
+        :param titles: One title per channel.
+        :param y_ranges: Initial (low, high) per channel; widened when the data leaves it.
+        :param span: Seconds of history shown.
+        :param columns: Channels are filled column by column.
+        """
+        fig = Figure(figsize=(width, height), dpi=dpi, layout="constrained")
+        super().__init__(fig)
+        self.setParent(parent)
+        self.setMinimumSize(int(width * dpi * 0.75), int(height * dpi * 0.75))
+        self.span = span
+
+        rows = math.ceil(len(titles) / columns)
+        grid = fig.subplots(rows, columns, sharex=True, squeeze=False)
+        self.axes = [grid[i % rows][i // rows] for i in range(len(titles))]
+        for ax in grid.flat[len(titles):]:
+            ax.set_visible(False)
+
+        self.lines = []
+        for ax, title, (low, high) in zip(self.axes, titles, y_ranges):
+            ax.set_title(title, fontsize=8, pad=2)
+            ax.set_xlim(-span, 0)
+            ax.set_ylim(low, high)
+            ax.tick_params(labelsize=7)
+            ax.grid(True)
+            line, = ax.plot([], [], lw=1, animated=True)
+            self.lines.append(line)
+
+        self._background = None
+        self.mpl_connect("draw_event", self._on_draw)
+
+    def _on_draw(self, event):
+        # full redraw (first show, resize, rescale): cache the static parts
+        self._background = self.copy_from_bbox(self.figure.bbox)
+        self._draw_lines()
+
+    def _draw_lines(self):
+        for ax, line in zip(self.axes, self.lines):
+            ax.draw_artist(line)
+
+    def update_lines(self, times, channels, now: float = None):
+        """
+        Show new data.
+        :param times: Timestamps (seconds) shared by all channels.
+        :param channels: One array of values per channel, same length as times.
+        :param now: Time at the right edge, the newest timestamp if None.
+        """
+        if len(times) == 0:
+            return
+        if now is None:
+            now = times[-1]
+        x = times - now
+
+        rescale = False
+        for ax, line, y in zip(self.axes, self.lines, channels):
+            line.set_data(*minmax(x, y, 2 * int(ax.bbox.width)))
+            low, high = ax.get_ylim()
+            y_min, y_max = y.min(), y.max()
+            if y_min < low or y_max > high:
+                # widen with some headroom so this does not happen every frame
+                margin = 0.2 * (max(high, y_max) - min(low, y_min))
+                ax.set_ylim(min(low, y_min - margin), max(high, y_max + margin))
+                rescale = True
+
+        if rescale:
+            self._background = None  # invalid until the next full draw
+            self.draw_idle()
+        if self._background is None:
+            return
+        self.restore_region(self._background)
+        self._draw_lines()
+        self.blit(self.figure.bbox)
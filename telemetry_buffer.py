@@ -0,0 +1,126 @@
+import time
+
+import numpy as np
+
+
+class TelemetryRing:
+    """
+    Fixed-size ring buffer for one group of channels.
+    Samples are stored column-wise in preallocated NumPy arrays (timestamps
+    plus one column per channel), so memory never grows and appends are O(1).
+    The buffer is allocated twice as long and every sample is written at i and
+    i + capacity, so the newest `capacity` samples are always contiguous and
+    window views are plain slices: no copy, no wrap-around handling.
+    """
+    def __init__(self, channel_names, capacity: int = 36000, dtype=np.float64):
+        """
+        :param channel_names: Names of the channels, in column order.
+        :param capacity: Number of samples kept per channel.
+        """
+        self.channel_names = list(channel_names)
+        self.channel_index = {name: i for i, name in enumerate(self.channel_names)}
+        self.capacity = capacity
+        self._times = np.zeros(2 * capacity, dtype=np.float64)
+        self._values = np.zeros((2 * capacity, len(self.channel_names)), dtype=dtype)
+        self._head = 0   # next write position in [0, capacity)
+        self.count = 0   # number of valid samples, up to capacity
+
+    def append(self, values, timestamp: float = None):
+        """
+        Add one sample for every channel.
+        :param values: One value per channel.
+        :param timestamp: Seconds (time.monotonic() if None).
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        i = self._head
+        self._times[i] = self._times[i + self.capacity] = timestamp
+        self._values[i] = self._values[i + self.capacity] = values
+        self._head = (i + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def extend(self, timestamps, values):
+        """
+        Add a batch of samples (N timestamps, N x channels values).
+        """
+        timestamps = np.asarray(timestamps)
+        values = np.asarray(values)
+        if len(timestamps) > self.capacity:
+            timestamps = timestamps[-self.capacity:]
+            values = values[-self.capacity:]
+        n = len(timestamps)
+        first = min(n, self.capacity - self._head)
+        for part, offset in ((slice(0, first), self._head), (slice(first, n), 0)):
+            length = part.stop - part.start
+            if length == 0:
+                continue
+            self._times[offset:offset + length] = timestamps[part]
+            self._times[offset + self.capacity:offset + self.capacity + length] = timestamps[part]
+            self._values[offset:offset + length] = values[part]
+            self._values[offset + self.capacity:offset + self.capacity + length] = values[part]
+        self._head = (self._head + n) % self.capacity
+        self.count = min(self.count + n, self.capacity)
+
+    def clear(self):
+        """
+        Forget all samples, e.g. before replaying from another point in time.
+        """
+        self._head = 0
+        self.count = 0
+
+    def last(self, n: int = None):
+        """
+        The newest n samples (all if None), oldest first, as views.
+        :return: (timestamps, values) with shapes (n,) and (n, channels).
+        """
+        n = self.count if n is None else min(n, self.count)
+        end = self._head + self.capacity
+        return self._times[end - n:end], self._values[end - n:end]
+
+    def window(self, seconds: float, now: float = None):
+        """
+        Samples of the last `seconds` (relative to `now` or the newest sample), as views.
+        """
+        times, values = self.last()
+        if len(times) == 0:
+            return times, values
+        if now is None:
+            now = times[-1]
+        start = np.searchsorted(times, now - seconds, side='left')
+        return times[start:], values[start:]
+
+    def channel(self, name: str, n: int = None):
+        """
+        (timestamps, values) of one channel, as views.
+        """
+        times, values = self.last(n)
+        return times, values[:, self.channel_index[name]]
+
+    def latest(self):
+        """
+        Newest value of every channel, or None if empty.
+        """
+        if self.count == 0:
+            return None
+        return self._values[self._head + self.capacity - 1]
+
+
+class TelemetryStore:
+    """
+    One TelemetryRing per channel group, e.g. "voltage" and "current".
+    """
+    def __init__(self, groups: dict, capacity: int = 36000):
+        """
+        :param groups: Group name -> list of channel names.
+        """
+        self.groups = {name: TelemetryRing(channels, capacity) for name, channels in groups.items()}
+
+    def __getitem__(self, group: str) -> TelemetryRing:
+        return self.groups[group]
+
+    def append(self, group: str, values, timestamp: float = None):
+        self.groups[group].append(values, timestamp)
+
+    def clear(self):
+        for ring in self.groups.values():
+            ring.clear()
@@ -0,0 +1,180 @@
+"""
+Binary telemetry frames for the Power Supply channels.
+
+Frame layout (little endian):
+    sync (0xA5) | length (uint16, payload bytes) | type (uint8) | payload | crc (uint16)
+The CRC is CRC-16/CCITT (binascii.crc_hqx, start 0xFFFF) over length, type and payload.
+
+A FRAME_SAMPLES payload is a batch of fixed-size records:
+    timestamp (uint32, microseconds) | 6 rail voltages (float32) | 6 rail currents (float32)
+in the same channel order as RailConfig.channel_names(): all voltages, then all currents.
+At 1 kHz a full sample stream is ~52 kB/s, which needs the USB link rather
+than the 115200 baud UART.
+
+The telemetry hub (telemetry_hub.py) uses the same framing on its sockets.
+Besides sample batches it sends replies, errors, link state and link
+statistics as JSON payloads, and FRAME_DROPPED (uint32, number of samples
+dropped for this client) after it had to skip batches for a slow client.
+Clients send FRAME_COMMAND with {"command": ..., "target": ...}; the target
+is optional and makes the command coalesced like SerialWorker.send_latest.
+"""
+
+import json
+import struct
+import binascii
+
+import numpy as np
+
+SYNC = 0xA5
+HEADER = struct.Struct("<BHB")   # sync, length, type
+CRC = struct.Struct("<H")
+MAX_PAYLOAD = 0xFFFF
+
+FRAME_SAMPLES = 0x01
+FRAME_REPLY = 0x02     # {"command": str, "reply": [str]}
+FRAME_ERROR = 0x03     # {"command": str, "error": str}
+FRAME_STATE = 0x04     # {"state": str}
+FRAME_STATS = 0x05     # link_stats.LinkStats.snapshot()
+FRAME_DROPPED = 0x06   # uint32
+FRAME_COMMAND = 0x10   # {"command": str, "target": str or None}
+DROPPED = struct.Struct("<I")
+
+NUM_CHANNELS = 12
+SAMPLE = struct.Struct("<I12f")
+SAMPLE_DTYPE = np.dtype([("t", "<u4"), ("values", "<f4", (NUM_CHANNELS,))])
+MAX_SAMPLES_PER_FRAME = MAX_PAYLOAD // SAMPLE.size
+MAX_FRAME = HEADER.size + MAX_PAYLOAD + CRC.size
+
+
+def crc16(data) -> int:
+    return binascii.crc_hqx(data, 0xFFFF)
+
+
+def encode_frame(frame_type: int, payload: bytes) -> bytes:
+    """
+    Wrap a payload into a frame.
+    """
+    if len(payload) > MAX_PAYLOAD:
+        raise ValueError(f"payload too long: {len(payload)} bytes")
+    body = HEADER.pack(SYNC, len(payload), frame_type) + payload
+    return body + CRC.pack(crc16(body[1:]))
+
+
+def encode_samples(timestamps_us, values) -> bytes:
+    """
+    Pack a batch of samples into one FRAME_SAMPLES frame.
+    :param timestamps_us: N timestamps in microseconds.
+    :param values: N x 12 channel values.
+    """
+    records = np.empty(len(timestamps_us), dtype=SAMPLE_DTYPE)
+    records["t"] = timestamps_us
+    records["values"] = values
+    return encode_frame(FRAME_SAMPLES, records.tobytes())
+
+
+def encode_message(frame_type: int, message: dict) -> bytes:
+    """
+    Wrap a JSON message into a frame.
+    """
+    return encode_frame(frame_type, json.dumps(message).encode())
+
+
+def decode_message(payload) -> dict:
+    return json.loads(bytes(payload))
+
+
+def decode_samples(payload) -> np.ndarray:
+    """
+    View a FRAME_SAMPLES payload as a structured array without copying.
+    result["t"] holds the timestamps, result["values"] the N x 12 channels.
+    """
+    return np.frombuffer(payload, dtype=SAMPLE_DTYPE)
+
+
+def iter_samples(payload):
+    """
+    Same as decode_samples, without NumPy: yields (timestamp, v0, ..., v11) tuples.
+    """
+    return SAMPLE.iter_unpack(payload)
+
+
+class FrameDecoder:
+    """
+    Incremental frame decoder over a preallocated byte buffer.
+    Incoming bytes are copied once into the buffer; the returned payloads are
+    memoryviews into it, so they are only valid until the next feed() call.
+    Garbage and frames with a bad CRC are skipped by searching for the next
+    sync byte.
+    Feed at most `chunk_size` bytes at a time: with a partial frame of any
+    length still in the buffer that always fits. A larger feed() can raise
+    BufferError; call reset() and carry on, the decoder resyncs on the next
+    sync byte.
+    """
+    def __init__(self, capacity: int = 1 << 17):
+        self._buffer = bytearray(capacity)
+        self.chunk_size = max(capacity - MAX_FRAME, capacity // 4)
+        self._view = memoryview(self._buffer)
+        self._read = 0
+        self._write = 0
+        self.crc_errors = 0
+        self.bytes_skipped = 0
+
+    def feed(self, data) -> list:
+        """
+        Add received bytes and decode every complete frame.
+        :param data: Bytes-like object from the serial port or socket.
+        :return: List of (frame_type, payload memoryview).
+        """
+        self._store(data)
+        buffer, view = self._buffer, self._view
+        frames = []
+        pos, end = self._read, self._write
+        while pos < end:
+            sync = buffer.find(SYNC, pos, end)
+            if sync < 0:
+                self.bytes_skipped += end - pos
+                pos = end
+                break
+            self.bytes_skipped += sync - pos
+            pos = sync
+            if end - pos < HEADER.size:
+                break
+            _, length, frame_type = HEADER.unpack_from(buffer, pos)
+            frame_end = pos + HEADER.size + length + CRC.size
+            if frame_end - pos > len(buffer):
+                # cannot be a real frame, it would not even fit the buffer
+                pos += 1
+                self.bytes_skipped += 1
+                continue
+            if frame_end > end:
+                break
+            payload_end = frame_end - CRC.size
+            (crc,) = CRC.unpack_from(buffer, payload_end)
+            if crc16(view[pos + 1:payload_end]) != crc:
+                self.crc_errors += 1
+                self.bytes_skipped += 1
+                pos += 1
+                continue
+            frames.append((frame_type, view[pos + HEADER.size:payload_end]))
+            pos = frame_end
+        self._read = pos
+        return frames
+
+    def reset(self):
+        """
+        Drop the buffered bytes (and any partial frame).
+        """
+        self._read = self._write = 0
+
+    def _store(self, data):
+        n = len(data)
+        if self._write + n > len(self._buffer):
+            # move the unread tail to the front; only same-size slice
+            # assignments, so exported views keep the buffer alive
+            unread = self._write - self._read
+            if unread + n > len(self._buffer):
+                raise BufferError(f"frame buffer overflow ({unread + n} bytes)")
+            self._buffer[:unread] = self._buffer[self._read:self._write]
+            self._read, self._write = 0, unread
+        self._buffer[self._write:self._write + n] = data
+        self._write += n
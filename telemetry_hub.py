@@ -0,0 +1,432 @@
+"""
+Telemetry hub: one process owns the serial link and shares it.
+
+Only one process can open the COM port, so the hub opens it and any number
+of viewers (RoverGUI.py --hub, scripts) connect to the hub instead, over a
+Unix socket or localhost TCP. Everything on the sockets is telemetry_frame
+framing:
+- samples are collected for `batch_interval` and sent as one FRAME_SAMPLES
+  frame, encoded once and shared by every client;
+- each client has a bounded send queue (`max_pending` bytes); a client that
+  does not keep up gets sample batches dropped, then a FRAME_DROPPED with
+  the count, and never slows the hub or the other clients down;
+- commands from clients go through a single SerialLink writer thread, so
+  they never interleave on the wire; the reply goes back to the client
+  that sent it (replies to coalesced commands go to every client).
+
+Samples come from the binary telemetry port (--telemetry-port, see
+telemetry_frame) or, without hardware, from the same fake channels as the GUI.
+
+Usage:
+    python telemetry_hub.py --listen unix:/tmp/rover_telemetry.sock --port /dev/ttyACM0
+    python telemetry_hub.py --listen tcp:127.0.0.1:7207 --fake-rate 1000
+"""
+
+import os
+import sys
+import time
+import queue
+import socket
+import argparse
+import selectors
+import threading
+from collections import deque
+from functools import partial
+
+import numpy as np
+from serial import Serial, SerialException
+
+from fake_channels import FakeChannelBank
+from rail_config import RailConfig
+from serial_link import SerialLink
+from telemetry_frame import (
+    FrameDecoder, encode_samples, encode_message, encode_frame, decode_samples, decode_message,
+    FRAME_SAMPLES, FRAME_REPLY, FRAME_ERROR, FRAME_STATE, FRAME_STATS, FRAME_DROPPED,
+    FRAME_COMMAND, DROPPED, MAX_SAMPLES_PER_FRAME, NUM_CHANNELS,
+)
+
+DEFAULT_ADDRESS = "unix:/tmp/rover_telemetry.sock" if hasattr(socket, "AF_UNIX") else "tcp:127.0.0.1:7207"
+BATCH_INTERVAL = 0.05       # seconds of samples per FRAME_SAMPLES
+MAX_PENDING = 1 << 20       # bytes queued per client before its samples are dropped
+STATS_INTERVAL = 1.0        # seconds between FRAME_STATS
+
+
+def parse_address(address: str):
+    """
+    "unix:/path" or "tcp:host:port" (a bare path or host:port works too).
+    :return: (socket family, address for bind/connect).
+    """
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:"):]
+    if address.startswith("tcp:"):
+        address = address[len("tcp:"):]
+    elif "/" in address:
+        return socket.AF_UNIX, address
+    host, _, port = address.rpartition(":")
+    return socket.AF_INET, (host or "127.0.0.1", int(port))
+
+
+class Subscriber:
+    """
+    One connected client, as seen by the hub.
+    """
+    def __init__(self, sock, address):
+        self.sock = sock
+        self.address = address
+        self.decoder = FrameDecoder(1 << 16)
+        self.outgoing = deque()     # memoryviews of frames, the first one maybe partly sent
+        self.pending = 0            # bytes in outgoing
+        self.dropped = 0            # samples dropped since the last FRAME_DROPPED
+        self.dropped_total = 0
+
+
+class TelemetryHub:
+    """
+    Fans telemetry out to the connected clients and forwards their commands.
+    The sockets are served by one selector loop (serve_forever); sample
+    sources and the serial writer run in their own threads and hand their
+    results to the loop through post().
+    """
+    def __init__(self, address: str = DEFAULT_ADDRESS, link: SerialLink = None,
+                 batch_interval: float = BATCH_INTERVAL, max_pending: int = MAX_PENDING):
+        """
+        :param address: Where to listen, see parse_address.
+        :param link: Serial link for client commands, None to refuse commands.
+        :param batch_interval: Seconds of samples collected into one frame.
+        :param max_pending: Bytes queued per client before its samples are dropped.
+        """
+        self.address = address
+        self.link = link
+        self.batch_interval = batch_interval
+        self.max_pending = max_pending
+        self.clients = {}
+        self.samples_in = 0
+        self.frames_out = 0
+
+        self._selector = selectors.DefaultSelector()
+        self._events = queue.Queue()
+        self._samples = queue.Queue()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._running = False
+        self._listener = None
+
+        if link is not None:
+            link.on_reply = lambda command, lines: self.post(self._broadcast_reply, command, lines)
+            link.on_error = lambda command, error: self.post(
+                self._broadcast, encode_message(FRAME_ERROR, {"command": command, "error": error}))
+            link.on_state_changed = lambda state: self.post(
+                self._broadcast, encode_message(FRAME_STATE, {"state": state}))
+
+    # thread-safe entry points
+    def publish(self, timestamps_us, values):
+        """
+        Add a batch of samples (N timestamps in microseconds, N x 12 values).
+        Called from the source threads; never blocks.
+        """
+        self._samples.put((timestamps_us, values))
+
+    def post(self, function, *args):
+        """
+        Run function(*args) in the hub loop.
+        """
+        self._events.put(partial(function, *args))
+        try:
+            self._wake_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass  # a wake-up is already pending
+
+    def stop(self):
+        self._running = False
+        self.post(lambda: None)
+
+    # the loop
+    def listen(self):
+        family, address = parse_address(self.address)
+        if family == socket.AF_UNIX and os.path.exists(address):
+            os.unlink(address)  # stale socket of an earlier hub
+        self._listener = socket.socket(family, socket.SOCK_STREAM)
+        if family != socket.AF_UNIX:
+            self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._listener.bind(address)
+        self._listener.listen()
+        self._listener.setblocking(False)
+        self._selector.register(self._listener, selectors.EVENT_READ, self._accept)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, self._wake)
+        return self
+
+    def serve_forever(self):
+        if self._listener is None:
+            self.listen()
+        self._running = True
+        next_batch = time.monotonic() + self.batch_interval
+        next_stats = time.monotonic() + STATS_INTERVAL
+        try:
+            while self._running:
+                timeout = max(0.0, min(next_batch, next_stats) - time.monotonic())
+                for key, mask in self._selector.select(timeout):
+                    key.data(key.fileobj, mask)
+                while True:
+                    try:
+                        self._events.get_nowait()()
+                    except queue.Empty:
+                        break
+                now = time.monotonic()
+                if now >= next_batch:
+                    self._send_batch()
+                    next_batch = now + self.batch_interval
+                if now >= next_stats:
+                    if self.link is not None:
+                        self._broadcast(encode_message(FRAME_STATS, self.link.stats.snapshot()))
+                    next_stats = now + STATS_INTERVAL
+        finally:
+            self._close()
+
+    def _close(self):
+        for client in list(self.clients.values()):
+            self._drop_client(client)
+        self._selector.unregister(self._listener)
+        self._listener.close()
+        family, address = parse_address(self.address)
+        if family == socket.AF_UNIX and os.path.exists(address):
+            os.unlink(address)
+        self._selector.close()
+
+    def _wake(self, sock, mask):
+        try:
+            while sock.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _accept(self, listener, mask):
+        try:
+            sock, address = listener.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+        sock.setblocking(False)
+        client = Subscriber(sock, address)
+        self.clients[sock] = client
+        self._selector.register(sock, selectors.EVENT_READ, self._service)
+        if self.link is not None:
+            self._send(client, encode_message(FRAME_STATS, self.link.stats.snapshot()))
+
+    def _drop_client(self, client):
+        # a failed send and the read that follows may both drop the same client
+        if self.clients.get(client.sock) is not client:
+            return
+        self._selector.unregister(client.sock)
+        client.sock.close()
+        del self.clients[client.sock]
+
+    def _service(self, sock, mask):
+        client = self.clients.get(sock)
+        if client is None:
+            return  # dropped earlier in this pass of the loop
+        if mask & selectors.EVENT_WRITE:
+            self._flush(client)
+        if mask & selectors.EVENT_READ and sock in self.clients:
+            try:
+                data = sock.recv(client.decoder.chunk_size)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                data = b""
+            if not data:
+                self._drop_client(client)
+                return
+            try:
+                frames = client.decoder.feed(data)
+            except BufferError:
+                self._drop_client(client)
+                return
+            for frame_type, payload in frames:
+                if sock not in self.clients:
+                    return  # an answer could not be sent, the client was dropped
+                if frame_type == FRAME_COMMAND:
+                    # a bad command is answered to its sender only, it must
+                    # not stop the loop that serves everybody
+                    try:
+                        message = decode_message(payload)
+                        command = message["command"]
+                        if not isinstance(command, str):
+                            raise ValueError("command must be a string")
+                    except (ValueError, KeyError, TypeError) as e:
+                        self._send(client, encode_message(FRAME_ERROR, {"command": "", "error": f"bad command: {e!r}"}))
+                        continue
+                    self._command(client, command, message.get("target"))
+
+    def _command(self, client, command, target=None):
+        if self.link is None:
+            self._send(client, encode_message(FRAME_ERROR, {"command": command, "error": "hub has no serial link"}))
+        elif target:
+            self.link.send_latest(str(target), command)
+        else:
+            self.link.send(command, partial(self._command_done, client, command))
+
+    def _command_done(self, client, command, future):
+        # runs in the writer thread
+        error = future.exception()
+        if error is not None:
+            frame = encode_message(FRAME_ERROR, {"command": command, "error": str(error)})
+        else:
+            frame = encode_message(FRAME_REPLY, {"command": command, "reply": _text(future.result())})
+        self.post(self._send, client, frame)
+
+    def _broadcast_reply(self, command, lines):
+        self._broadcast(encode_message(FRAME_REPLY, {"command": command, "reply": _text(lines)}))
+
+    # sending
+    def _send_batch(self):
+        batches = []
+        while True:
+            try:
+                batches.append(self._samples.get_nowait())
+            except queue.Empty:
+                break
+        if not batches:
+            return
+        timestamps = np.concatenate([np.atleast_1d(t) for t, _ in batches])
+        values = np.concatenate([np.atleast_2d(v) for _, v in batches])
+        self.samples_in += len(timestamps)
+        for start in range(0, len(timestamps), MAX_SAMPLES_PER_FRAME):
+            stop = start + MAX_SAMPLES_PER_FRAME
+            frame = encode_samples(timestamps[start:stop], values[start:stop])
+            n = len(timestamps[start:stop])
+            for client in list(self.clients.values()):
+                self._send(client, frame, n)
+
+    def _broadcast(self, frame):
+        for client in list(self.clients.values()):
+            self._send(client, frame)
+
+    def _send(self, client, frame, samples: int = 0):
+        """
+        Queue a frame for one client, unless it has been dropped. Sample frames
+        that do not fit the client's queue are dropped; other frames are always
+        queued.
+        """
+        if client.sock not in self.clients:
+            return
+        if samples:
+            if client.pending + len(frame) > self.max_pending:
+                client.dropped += samples
+                client.dropped_total += samples
+                return
+            if client.dropped:
+                notice = encode_frame(FRAME_DROPPED, DROPPED.pack(min(client.dropped, 0xFFFFFFFF)))
+                client.outgoing.append(memoryview(notice))
+                client.pending += len(notice)
+                client.dropped = 0
+        client.outgoing.append(memoryview(frame))
+        client.pending += len(frame)
+        self.frames_out += 1
+        self._flush(client)
+
+    def _flush(self, client):
+        if client.sock not in self.clients:
+            return
+        try:
+            while client.outgoing:
+                head = client.outgoing[0]
+                sent = client.sock.send(head)
+                client.pending -= sent
+                if sent < len(head):
+                    client.outgoing[0] = head[sent:]
+                    break
+                client.outgoing.popleft()
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError:
+            self._drop_client(client)
+            return
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if client.outgoing else 0)
+        if self._selector.get_key(client.sock).events != events:
+            self._selector.modify(client.sock, events, self._service)
+
+
+def _text(lines):
+    return [line.decode(errors="replace") if isinstance(line, bytes) else line for line in lines]
+
+
+def run_fake_source(hub: TelemetryHub, rate: float, stop: threading.Event):
+    """
+    Publish the GUI's fake Power Supply channels at `rate` samples per second.
+    """
+    specs = RailConfig.load().fake_specs()
+    if len(specs) != NUM_CHANNELS:
+        raise ValueError(f"sample frames carry {NUM_CHANNELS} channels, rails.json has {len(specs) // 2} rails")
+    bank = FakeChannelBank.from_specs(specs)
+    start = time.monotonic()
+    sent = 0
+    while not stop.is_set():
+        due = int((time.monotonic() - start) * rate) - sent
+        if due > 0:
+            values = np.array([bank.step() for _ in range(due)])
+            t_us = ((sent + np.arange(due)) / rate * 1e6).astype(np.uint64) & 0xFFFFFFFF
+            hub.publish(t_us, values)
+            sent += due
+        stop.wait(min(0.01, 1 / rate))
+
+
+def run_serial_source(hub: TelemetryHub, port: str, baudrate: int, stop: threading.Event):
+    """
+    Publish the FRAME_SAMPLES frames received on the telemetry port.
+    """
+    decoder = FrameDecoder()
+    while not stop.is_set():
+        try:
+            with Serial(port=port, baudrate=baudrate, timeout=0.1) as ser:
+                while not stop.is_set():
+                    data = ser.read(min(ser.in_waiting, decoder.chunk_size) or 1)
+                    for frame_type, payload in decoder.feed(data):
+                        if frame_type == FRAME_SAMPLES:
+                            samples = decode_samples(payload)
+                            hub.publish(samples["t"].copy(), samples["values"].copy())
+        except (SerialException, OSError) as e:
+            print(f"telemetry port {port}: {e}", file=sys.stderr)
+            stop.wait(1.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Share the rover's serial link with local viewers")
+    parser.add_argument("--listen", default=DEFAULT_ADDRESS, help="unix:PATH or tcp:HOST:PORT")
+    parser.add_argument("--port", default=None, help="command port (default: look for the board)")
+    parser.add_argument("--baud", type=int, default=115200)
+    parser.add_argument("--no-commands", action="store_true", help="do not open the command port")
+    parser.add_argument("--telemetry-port", default=None, help="port sending FRAME_SAMPLES frames")
+    parser.add_argument("--telemetry-baud", type=int, default=921600)
+    parser.add_argument("--fake-rate", type=float, default=10.0,
+                        help="samples/s of fake data when there is no telemetry port")
+    parser.add_argument("--max-pending", type=int, default=MAX_PENDING,
+                        help="bytes queued per client before its samples are dropped")
+    args = parser.parse_args()
+
+    link = None if args.no_commands else SerialLink(args.port, args.baud)
+    hub = TelemetryHub(args.listen, link, max_pending=args.max_pending).listen()
+    stop = threading.Event()
+    threads = []
+    if link is not None:
+        threads.append(threading.Thread(target=link.run, daemon=True))
+    if args.telemetry_port:
+        threads.append(threading.Thread(target=run_serial_source, daemon=True,
+                                        args=(hub, args.telemetry_port, args.telemetry_baud, stop)))
+    else:
+        threads.append(threading.Thread(target=run_fake_source, daemon=True,
+                                        args=(hub, args.fake_rate, stop)))
+    for thread in threads:
+        thread.start()
+    print(f"telemetry hub listening on {args.listen}")
+    try:
+        hub.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        if link is not None:
+            link.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+"""
+Append-only on-disk telemetry log.
+
+A session is a directory with meta.json and numbered segment files of
+fixed-width little-endian records: timestamp (float64, seconds) followed by
+one float32 per channel. The segment being written is called *.bin.part and
+renamed to *.bin when it is full, SEGMENT_SECONDS after it was opened or when
+the recorder stops, so a crash leaves at most that much in the .part file.
+
+Every finished segment also gets a sparse time index (*.idx: the timestamp
+and record offset of every INDEX_EVERY-th record), and manifest.json lists
+the segments with their first/last timestamps. Finding a time is then a
+binary search over the manifest, the index and one short run of records.
+TelemetryLog also reads the segments the manifest does not list yet (the
+open .part file of a running session, or what a crash left behind): whole
+records only, with the time index built in memory.
+"""
+
+import os
+import json
+import time
+import queue
+import threading
+
+import numpy as np
+
+SEGMENT_RECORDS = 1 << 20   # records per segment file
+SEGMENT_SECONDS = 60.0      # seconds before a segment is finished, however few records it has
+QUEUE_SIZE = 4096           # pending batches before the recorder drops samples
+INDEX_EVERY = 1024          # records between two time index entries
+STOP_POLL = 0.1             # seconds between checks that the writer is still alive in stop()
+
+INDEX_DTYPE = np.dtype([("t", "<f8"), ("offset", "<i8")])
+
+
+def record_dtype(n_channels: int) -> np.dtype:
+    return np.dtype([("t", "<f8"), ("values", "<f4", (n_channels,))])
+
+
+def segment_name(index: int) -> str:
+    return f"segment_{index:06d}.bin"
+
+
+def index_name(segment_file: str) -> str:
+    return segment_file[:-len(".bin")] + ".idx"
+
+
+def build_time_index(t, index_every: int = INDEX_EVERY) -> np.ndarray:
+    """
+    Sparse time index of a whole segment, the same as its *.idx file.
+    """
+    positions = np.arange(0, len(t), index_every)
+    entries = np.empty(len(positions), dtype=INDEX_DTYPE)
+    entries["t"] = t[positions]
+    entries["offset"] = positions
+    return entries
+
+
+class TelemetryRecorder:
+    """
+    Writes telemetry samples to a session directory from a background thread.
+    record() only puts the sample on a bounded queue and never waits on the
+    disk; if the writer falls behind, new samples are dropped and counted.
+    If writing fails (e.g. the disk is full) the writer keeps the exception
+    in `error`, closes what it can and stops; later samples are dropped and
+    stop() raises the exception.
+    """
+    def __init__(self, directory: str, channel_names, segment_records: int = SEGMENT_RECORDS,
+                 queue_size: int = QUEUE_SIZE, index_every: int = INDEX_EVERY,
+                 segment_seconds: float = SEGMENT_SECONDS):
+        """
+        :param directory: Session directory, created if needed.
+        :param channel_names: Names of the recorded channels, in column order.
+        :param segment_records: Records per segment file.
+        :param index_every: Records between two time index entries.
+        :param segment_seconds: Seconds after which a segment is finished anyway.
+        """
+        self.directory = directory
+        self.channel_names = list(channel_names)
+        self.dtype = record_dtype(len(self.channel_names))
+        self.segment_records = segment_records
+        self.index_every = index_every
+        self.segment_seconds = segment_seconds
+        self.manifest = []
+        self._index = []
+        self._first_t = None
+        self._last_t = None
+        self.dropped = 0
+        self.written = 0
+        self.error = None
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, "meta.json"), "w") as f:
+            json.dump({"channels": self.channel_names, "segment_records": segment_records,
+                       "segment_seconds": segment_seconds, "dtype": self.dtype.descr}, f)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def record(self, timestamp: float, values):
+        """
+        Queue one sample (one value per channel). Never blocks.
+        """
+        self._put((timestamp, np.asarray(values, dtype="<f4")))
+
+    def record_many(self, timestamps, values):
+        """
+        Queue a batch of samples (N timestamps, N x channels values). Never blocks.
+        """
+        batch = np.empty(len(timestamps), dtype=self.dtype)
+        batch["t"] = timestamps
+        batch["values"] = values
+        self._put(batch)
+
+    def _put(self, item):
+        if self.error is not None:
+            self.dropped += 1 if isinstance(item, tuple) else len(item)
+            return
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1 if isinstance(item, tuple) else len(item)
+
+    def stop(self):
+        """
+        Write everything still queued, finish the open segment and stop.
+        Does not hang if the writer has died with the queue full.
+        :raises Exception: The error that stopped the writer, if any (e.g. OSError for a full disk).
+        """
+        if self._thread is not None:
+            while self._thread.is_alive():
+                try:
+                    self._queue.put(None, timeout=STOP_POLL)
+                    break
+                except queue.Full:
+                    pass
+            self._thread.join()
+            self._thread = None
+        if self.error is not None:
+            raise self.error
+
+    def _run(self):
+        segment = len(self.manifest)
+        f, in_segment, opened = None, 0, 0.0
+        running = True
+        try:
+            while running:
+                # an open segment is finished on time even if no samples come
+                timeout = None if f is None else max(opened + self.segment_seconds - time.monotonic(), 0.0)
+                try:
+                    items = [self._queue.get(timeout=timeout)]
+                except queue.Empty:
+                    items = []
+                try:
+                    while True:
+                        items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    pass
+                if any(item is None for item in items):
+                    running = False
+                    items = [item for item in items if item is not None]
+                batch = self._to_records(items) if items else np.empty(0, dtype=self.dtype)
+
+                pos = 0
+                while pos < len(batch):
+                    if f is None:
+                        f = open(os.path.join(self.directory, segment_name(segment) + ".part"), "wb")
+                        in_segment, opened = 0, time.monotonic()
+                    n = min(len(batch) - pos, self.segment_records - in_segment)
+                    chunk = batch[pos:pos + n]
+                    f.write(chunk.tobytes())
+                    self._index_chunk(chunk, in_segment)
+                    pos += n
+                    in_segment += n
+                    self.written += n
+                    if in_segment == self.segment_records:
+                        self._finish_segment(f, segment)
+                        f, segment = None, segment + 1
+                if f is not None:
+                    if time.monotonic() - opened >= self.segment_seconds:
+                        self._finish_segment(f, segment)
+                        f, segment = None, segment + 1
+                    else:
+                        f.flush()
+
+            if f is not None:
+                self._finish_segment(f, segment)
+        except Exception as e:
+            # e.g. the disk is full: keep the error for stop() and drop what is left
+            self.error = e
+            if f is not None and not f.closed:
+                f.close()
+            try:
+                while True:
+                    item = self._queue.get_nowait()
+                    if item is not None:
+                        self.dropped += 1 if isinstance(item, tuple) else len(item)
+            except queue.Empty:
+                pass
+
+    def _to_records(self, items):
+        batches = []
+        singles = [item for item in items if isinstance(item, tuple)]
+        if len(singles) == len(items):
+            batch = np.empty(len(singles), dtype=self.dtype)
+            batch["t"] = [t for t, _ in singles]
+            batch["values"] = [v for _, v in singles]
+            return batch
+        for item in items:
+            if isinstance(item, tuple):
+                single = np.empty(1, dtype=self.dtype)
+                single["t"], single["values"] = item
+                batches.append(single)
+            else:
+                batches.append(item)
+        return np.concatenate(batches)
+
+    def _index_chunk(self, chunk, in_segment):
+        # entries for the records at segment offsets 0, index_every, 2 * index_every, ...
+        positions = np.arange((-in_segment) % self.index_every, len(chunk), self.index_every)
+        entries = np.empty(len(positions), dtype=INDEX_DTYPE)
+        entries["t"] = chunk["t"][positions]
+        entries["offset"] = in_segment + positions
+        self._index.append(entries)
+        if self._first_t is None:
+            self._first_t = float(chunk["t"][0])
+        self._last_t = float(chunk["t"][-1])
+
+    def _finish_segment(self, f, segment):
+        records = f.tell() // self.dtype.itemsize
+        f.flush()
+        os.fsync(f.fileno())
+        f.close()
+        name = segment_name(segment)
+        part = os.path.join(self.directory, name + ".part")
+        np.concatenate(self._index).tofile(os.path.join(self.directory, index_name(name)))
+        os.replace(part, os.path.join(self.directory, name))
+
+        self.manifest.append({"name": name, "records": records,
+                              "first_t": self._first_t, "last_t": self._last_t})
+        tmp = os.path.join(self.directory, "manifest.json.tmp")
+        with open(tmp, "w") as m:
+            json.dump(self.manifest, m)
+        os.replace(tmp, os.path.join(self.directory, "manifest.json"))
+        self._index, self._first_t, self._last_t = [], None, None
+
+
+class TelemetryLog:
+    """
+    Read access to a recorded session. Segments are opened with
+    numpy.memmap, so slicing a long log does not load it into RAM, and
+    locate()/time_range() use the manifest and the sparse time indexes to find
+    a time in O(log n). A running or crashed session is readable too, up to
+    its last whole record; refresh() picks up what was written since.
+    """
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+        self.channel_names = meta["channels"]
+        self.dtype = record_dtype(len(self.channel_names))
+        self.refresh()
+
+    def refresh(self):
+        """
+        Pick up segments written since the log was opened.
+        """
+        try:
+            with open(os.path.join(self.directory, "manifest.json")) as f:
+                self.manifest = json.load(f)
+        except FileNotFoundError:
+            self.manifest = []
+        self._segments = {}
+        self._indexes = {}
+        self._recover_unlisted()
+        self.segment_paths = [os.path.join(self.directory, entry["name"]) for entry in self.manifest]
+        self.records = np.array([entry["records"] for entry in self.manifest], dtype=np.int64)
+        self.first_t = np.array([entry["first_t"] for entry in self.manifest])
+        self.last_t = np.array([entry["last_t"] for entry in self.manifest])
+
+    def _recover_unlisted(self):
+        # segments after the manifest: one renamed just before a crash, then
+        # the .part file that is being written or that a crash left behind.
+        # Only whole records are used and the files are not changed.
+        segment = len(self.manifest)
+        while True:
+            path = os.path.join(self.directory, segment_name(segment))
+            if not os.path.exists(path):
+                path += ".part"
+                if not os.path.exists(path):
+                    return
+            records = os.path.getsize(path) // self.dtype.itemsize
+            if records == 0:
+                return
+            data = np.memmap(path, dtype=self.dtype, mode="r", shape=(records,))
+            self.manifest.append({"name": os.path.basename(path), "records": records,
+                                  "first_t": float(data["t"][0]), "last_t": float(data["t"][-1])})
+            self._segments[segment] = data
+            self._indexes[segment] = build_time_index(data["t"])
+            if path.endswith(".part"):
+                return
+            segment += 1
+
+    def __len__(self):
+        return int(self.records.sum())
+
+    def segment(self, index: int) -> np.memmap:
+        """
+        Records of one segment; fields "t" and "values".
+        """
+        if index not in self._segments:
+            self._segments[index] = np.memmap(self.segment_paths[index], dtype=self.dtype, mode="r")
+        return self._segments[index]
+
+    def segments(self):
+        for index in range(len(self.segment_paths)):
+            yield self.segment(index)
+
+    def time_index(self, index: int) -> np.ndarray:
+        """
+        Sparse (t, offset) index of one segment.
+        """
+        if index not in self._indexes:
+            self._indexes[index] = np.fromfile(index_name(self.segment_paths[index]), dtype=INDEX_DTYPE)
+        return self._indexes[index]
+
+    def locate(self, t: float):
+        """
+        Position of the first record at or after time t.
+        :return: (segment, offset); (number of segments, 0) if t is after the end.
+        """
+        segment = max(int(np.searchsorted(self.first_t, t, side='right')) - 1, 0)
+        if segment >= len(self.manifest) or t > self.last_t[segment]:
+            return segment + 1 if segment < len(self.manifest) else segment, 0
+        time_index = self.time_index(segment)
+        entry = int(np.searchsorted(time_index["t"], t, side='right')) - 1
+        low = int(time_index["offset"][entry]) if entry >= 0 else 0
+        high = int(time_index["offset"][entry + 1]) + 1 if entry + 1 < len(time_index) else int(self.records[segment])
+        records = self.segment(segment)
+        return segment, low + int(np.searchsorted(records["t"][low:high], t, side='left'))
+
+    def time_range(self, t_start: float, t_end: float):
+        """
+        Records with t_start <= t < t_end, as memmap views (one per segment).
+        """
+        segment, offset = self.locate(t_start)
+        end_segment, end_offset = self.locate(t_end)
+        while segment < len(self.manifest) and (segment, offset) < (end_segment, end_offset):
+            stop = end_offset if segment == end_segment else int(self.records[segment])
+            if stop > offset:
+                yield self.segment(segment)[offset:stop]
+            segment, offset = segment + 1, 0
+
+
+def new_session_directory(root: str) -> str:
+    """
+    root/<date>_<time>, e.g. telemetry_logs/20250301_142501.
+    """
+    return os.path.join(root, time.strftime("%Y%m%d_%H%M%S"))
@@ -0,0 +1,100 @@
+import time
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from telemetry_recorder import TelemetryLog
+
+REPLAY_SPEEDS = {"1x": 1.0, "10x": 10.0, "max": 0.0}
+
+
+class TelemetryReplay(QObject):
+    """
+    Plays a recorded session (see telemetry_recorder) back in place of live data.
+    Samples are handed out in batches through samples_ready, paced by the
+    wall clock times `speed`. With speed 0 every tick sends the next
+    max_batch records as fast as the event loop allows, which makes the replay
+    a throughput benchmark for whatever consumes the samples.
+    """
+    samples_ready = pyqtSignal(object, object)   # timestamps (N,), values (N, channels)
+    position_changed = pyqtSignal(float)         # log time of the replay position
+    finished = pyqtSignal()
+
+    def __init__(self, directory: str, speed: float = 1.0, tick_ms: int = 10, max_batch: int = 10000):
+        super().__init__()
+        self.log = TelemetryLog(directory)
+        if len(self.log) == 0:
+            raise ValueError(f"no records in {directory}")
+        self.start_time = float(self.log.first_t[0])
+        self.end_time = float(self.log.last_t[-1])
+        self.speed = speed
+        self.tick_ms = tick_ms
+        self.max_batch = max_batch
+        self.samples_sent = 0
+
+        self._cursor = (0, 0)            # (segment, offset) of the next record
+        self._position = self.start_time
+        self._anchor = None              # (wall clock, log time) when playing started
+        self.timer = QTimer()
+        self.timer.timeout.connect(self._tick)
+
+    @property
+    def playing(self) -> bool:
+        return self.timer.isActive()
+
+    def play(self):
+        self._anchor = (time.monotonic(), self._position)
+        self.timer.start(0 if self.speed == 0 else self.tick_ms)
+
+    def pause(self):
+        self.timer.stop()
+
+    def set_speed(self, speed: float):
+        self.speed = speed
+        if self.playing:
+            self.play()
+
+    def seek(self, t: float):
+        """
+        Continue from log time t.
+        """
+        t = min(max(t, self.start_time), self.end_time)
+        self._cursor = self.log.locate(t)
+        self._position = t
+        self.position_changed.emit(t)
+        if self.playing:
+            self.play()
+
+    def _tick(self):
+        if self.speed == 0:
+            end = (len(self.log.manifest), 0)
+        else:
+            wall, log_time = self._anchor
+            end = self.log.locate(log_time + (time.monotonic() - wall) * self.speed)
+        self._send_until(end)
+
+        segment, offset = self._cursor
+        if segment >= len(self.log.manifest):
+            self.timer.stop()
+            self._position = self.end_time
+            self.finished.emit()
+        elif self.speed != 0 and (segment, offset) >= end:
+            # caught up with the clock: the position is where the clock is
+            self._position = log_time + (time.monotonic() - wall) * self.speed
+        self.position_changed.emit(self._position)
+
+    def _send_until(self, end):
+        budget = self.max_batch
+        segment, offset = self._cursor
+        while budget and segment < len(self.log.manifest) and (segment, offset) < end:
+            records = int(self.log.records[segment])
+            stop = min(end[1] if segment == end[0] else records, offset + budget)
+            if stop > offset:
+                part = self.log.segment(segment)[offset:stop]
+                self.samples_ready.emit(part["t"], part["values"])
+                self.samples_sent += stop - offset
+                budget -= stop - offset
+                self._position = float(part["t"][-1])
+                offset = stop
+            if offset >= records:
+                segment, offset = segment + 1, 0
+        self._cursor = (segment, offset)
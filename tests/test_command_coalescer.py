@@ -0,0 +1,57 @@
+from command_coalescer import CommandCoalescer
+
+
+def test_burst_of_clicks_costs_one_command_per_target():
+    coalescer = CommandCoalescer()
+    for command in ("green on\n", "off\n", "blink\n", "off\n"):
+        assert coalescer.put("led", command)
+    coalescer.put("3v3", "power 3v3 on\n")
+    assert sorted(coalescer.take()) == [("3v3", "power 3v3 on\n"), ("led", "off\n")]
+    assert coalescer.take() == [] and not coalescer.ready()
+
+
+def test_target_in_flight_is_held_back_and_latest_wins():
+    coalescer = CommandCoalescer()
+    coalescer.put("led", "green on\n")
+    assert coalescer.take() == [("led", "green on\n")]
+    coalescer.put("led", "off\n")
+    coalescer.put("led", "blink\n")
+    assert not coalescer.ready() and coalescer.take() == []
+    coalescer.acknowledge("led", "green on\n", True)
+    assert coalescer.take() == [("led", "blink\n")]
+
+
+def test_acknowledged_state_is_skipped():
+    coalescer = CommandCoalescer()
+    coalescer.put("led", "off\n")
+    coalescer.acknowledge("led", *coalescer.take()[0][1:], True)
+    assert not coalescer.put("led", "off\n")
+    # a wish made while the same command was in flight is dropped once it is acked
+    coalescer.put("led", "green on\n")
+    coalescer.take()
+    coalescer.put("led", "green on\n")
+    coalescer.acknowledge("led", "green on\n", True)
+    assert not coalescer.ready()
+
+
+def test_failed_command_is_sent_again():
+    coalescer = CommandCoalescer()
+    coalescer.put("led", "off\n")
+    coalescer.acknowledge("led", "off\n", True)   # the device is off
+    coalescer.put("led", "green on\n")
+    coalescer.take()
+    coalescer.acknowledge("led", "green on\n", False)
+    # the state is unknown now: even "off" goes out again
+    assert coalescer.put("led", "off\n")
+    assert coalescer.take() == [("led", "off\n")]
+    coalescer.acknowledge("led", "off\n", False)
+    assert coalescer.put("led", "off\n")
+    assert coalescer.take() == [("led", "off\n")]
+
+
+def test_forget_after_reconnect():
+    coalescer = CommandCoalescer()
+    coalescer.put("led", "off\n")
+    coalescer.acknowledge("led", *coalescer.take()[0][1:], True)
+    coalescer.forget()
+    assert coalescer.put("led", "off\n")
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from downsample import minmax, lttb, Downsampler
+
+N = 200_000
+
+
+@pytest.fixture
+def series():
+    x = np.arange(N) * 0.01
+    y = np.random.default_rng(0).normal(12.0, 0.05, N)
+    y[123_457] = 20.0    # one voltage spike
+    return x, y
+
+
+def test_minmax_keeps_bucket_extremes(series):
+    x, y = series
+    xs, ys = minmax(x, y, 2000)
+    assert len(xs) <= 2002
+    assert ys.max() == 20.0 and ys.min() == y.min()
+    assert np.all(np.diff(xs) > 0)
+
+
+def test_lttb_keeps_endpoints(series):
+    x, y = series
+    xs, ys = lttb(x, y, 500)
+    assert len(xs) == 500
+    assert xs[0] == x[0] and xs[-1] == x[-1]
+    assert np.all(np.diff(xs) > 0)
+
+
+@pytest.mark.parametrize("method", ["minmax", "lttb"])
+def test_view_size_depends_on_pixels_not_length(series, method):
+    x, y = series
+    downsampler = Downsampler(x, y, method)
+    for x_min, x_max in [(0, x[-1]), (100, 1100), (500, 520)]:
+        xs, ys = downsampler.view(x_min, x_max, 400)
+        assert len(xs) <= 4 * 2 * 400 + 4
+        # one point outside the range on each side
+        assert xs[0] <= x_min and xs[-1] >= x_max
+
+
+def test_spike_survives_every_zoom(series):
+    x, y = series
+    downsampler = Downsampler(x, y, "minmax")
+    for half_width in (1000, 100, 10, 1):
+        xs, ys = downsampler.view(x[123_457] - half_width, x[123_457] + half_width, 300)
+        assert ys.max() == 20.0
+
+
+def test_tiles_are_cached_per_zoom_level(series):
+    x, y = series
+    downsampler = Downsampler(x, y, "minmax")
+    downsampler.view(0, 400, 500)
+    computed = set(downsampler._cache)
+    # panning at the same zoom only adds the tiles that come into view
+    for step in range(10):
+        downsampler.view(step * 5, 400 + step * 5, 500)
+    levels = {level for level, _ in downsampler._cache}
+    assert len(levels) == 1 and computed <= set(downsampler._cache)
+    before = dict(downsampler._cache)
+    downsampler.view(0, 400, 500)
+    assert all(downsampler._cache[key] is before[key] for key in computed)
+
+
+def test_short_series_is_drawn_as_is():
+    x = np.arange(10.0)
+    xs, ys = Downsampler(x, x * 2).view(2, 5, 400)
+    assert list(xs) == [1, 2, 3, 4, 5, 6]
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from fake_channels import FakeChannelBank, FAKE_STATUS_SPECS
+
+STEPS = 20000
+
+
+def run(bank, steps=STEPS, warm_up=500):
+    for _ in range(warm_up):
+        bank.step()
+    return np.array([bank.step().copy() for _ in range(steps)])
+
+
+@pytest.fixture
+def samples():
+    bank = FakeChannelBank([0.0, 100.0, 5.0], [1.0, 100.0, -5.0], [0.1, 2.0, 0.01], seed=1)
+    return run(bank)
+
+
+def test_channels_return_to_their_ideal_values(samples):
+    # the process keeps a memory of about ten steps, so the mean of
+    # STEPS samples is off by a few std_dev / sqrt(STEPS / 10) at most
+    ideal, std = np.array([1.0, 100.0, -5.0]), np.array([0.1, 2.0, 0.01])
+    assert np.all(np.abs(samples.mean(axis=0) - ideal) < 5 * 2.4 * std / np.sqrt(STEPS / 10))
+
+
+def test_noise_of_every_channel_follows_its_std_dev(samples):
+    std = np.array([0.1, 2.0, 0.01])
+    # with alpha = beta = 0.1 the values are an AR(2) process,
+    # x[t] - ideal = 1.0 (x[t-1] - ideal) - 0.1 (x[t-2] - ideal) + noise:
+    # its standard deviation is sqrt(1.1 / 0.189) = 2.41 std_dev, and
+    # that of one step is sqrt(2 * 5.82 * (1 - 1 / 1.1)) = 1.03 std_dev
+    assert samples.std(axis=0) / std == pytest.approx(np.full(3, 2.41), rel=0.1)
+    assert np.diff(samples, axis=0).std(axis=0) / std == pytest.approx(np.full(3, 1.03), rel=0.05)
+
+
+def test_channels_are_independent(samples):
+    correlation = np.corrcoef(np.diff(samples, axis=0).T)
+    assert np.all(np.abs(correlation[np.triu_indices(3, 1)]) < 0.05)
+
+
+def test_from_specs_and_seed():
+    specs = [spec[1:] for spec in FAKE_STATUS_SPECS]
+    bank = FakeChannelBank.from_specs(specs, seed=3)
+    assert len(bank) == len(FAKE_STATUS_SPECS)
+    assert list(bank.alpha) == list(bank.beta) == [0.1] * len(specs)
+    again = FakeChannelBank.from_specs(specs, seed=3)
+    assert np.array_equal(run(bank, 10, 0), run(again, 10, 0))
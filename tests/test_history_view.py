@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from history_view import ChannelHistory
+from telemetry_recorder import TelemetryRecorder, TelemetryLog
+
+N = 100_000
+
+
+@pytest.fixture(scope="module")
+def log(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("session")
+    recorder = TelemetryRecorder(str(directory), ["a voltage", "a current"], segment_records=7000).start()
+    t = 1000.0 + np.arange(N) * 0.001
+    values = np.stack([np.full(N, 12.0), np.arange(N) % 100 * 0.01], axis=1)
+    values[54_321, 0] = 20.0    # one voltage spike
+    recorder.record_many(t, values)
+    recorder.stop()
+    return TelemetryLog(str(directory))
+
+
+@pytest.mark.parametrize("method", ["minmax", "lttb"])
+def test_overview_is_bounded_and_starts_at_zero(log, method):
+    channel = ChannelHistory(log, 0, method, overview_buckets=1000)
+    assert channel.bucket == 128
+    assert len(channel.x) <= 2 * 1000 + 2 * len(log.manifest)
+    assert channel.x[0] == 0.0 and channel.x[-1] == pytest.approx((N - 1) * 0.001)
+
+
+def test_spike_is_kept_from_overview_to_records(log):
+    channel = ChannelHistory(log, 0, "minmax", overview_buckets=1000)
+    spike = 54.321
+    for half_width in (50.0, 5.0, 0.5, 0.05):
+        x, y = channel.view(spike - half_width, spike + half_width, 400)
+        assert y.max() == 20.0
+        assert len(x) <= 4 * 2 * 400 + 4
+
+
+def test_narrow_views_read_the_records(log):
+    channel = ChannelHistory(log, 1, "minmax", overview_buckets=1000)
+    x, y = channel.view(10.0, 10.2, 400)
+    # 200 records, fewer than two per pixel, all of them drawn
+    assert len(x) == 200
+    assert np.allclose(y, np.arange(10_000, 10_200) % 100 * 0.01)
+
+
+def test_short_session_is_its_own_overview(log):
+    channel = ChannelHistory(log, 1, "lttb")
+    assert channel.bucket == 1 and len(channel.x) == N
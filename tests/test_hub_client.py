@@ -0,0 +1,28 @@
+import os
+
+import numpy as np
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QCoreApplication
+
+from hub_client import HubClient
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def test_timestamps_unwrap_and_restart_after_reconnect(app, tmp_path):
+    client = HubClient(str(tmp_path / "hub.sock"))
+    assert list(client._seconds(np.array([2**32 - 2_000_000, 2**32 - 1_000_000], dtype=np.uint32))) == \
+        [4292.967296, 4293.967296]
+    # the counter wraps
+    assert list(client._seconds(np.array([0, 1_000_000], dtype=np.uint32))) == [4294.967296, 4295.967296]
+
+    client._lost()
+    client.reconnect_timer.stop()
+    # a restarted hub starts low again
+    assert list(client._seconds(np.array([500_000, 1_500_000], dtype=np.uint32))) == [0.5, 1.5]
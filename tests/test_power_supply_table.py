@@ -0,0 +1,58 @@
+import os
+
+import numpy as np
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QCoreApplication
+
+from power_supply_table import PowerSupplyModel, VOLTAGE, CURRENT, STATUS, changed_runs
+from rail_alarms import OK, OFF
+
+NAMES = ["3.3V", "5V", "12V", "19V", "24V", "56V"]
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture
+def model(app):
+    model = PowerSupplyModel(NAMES, ["spec"] * len(NAMES))
+    model.set_values(np.arange(6.0), np.arange(6.0) * 10)
+    model.set_states(np.full(6, OK, dtype=np.int8))
+    model.changes = []
+    model.dataChanged.connect(lambda top_left, bottom_right, roles=():
+                              model.changes.append(((top_left.row(), top_left.column()),
+                                                    (bottom_right.row(), bottom_right.column()))))
+    return model
+
+
+def test_changed_runs():
+    assert list(changed_runs(np.array([1, 1, 0, 0, 1, 0, 1, 1], dtype=bool))) == [(0, 2), (4, 5), (6, 8)]
+    assert list(changed_runs(np.zeros(4, dtype=bool))) == []
+
+
+def test_values_signal_only_the_changed_rows(model):
+    voltages, currents = np.arange(6.0), np.arange(6.0) * 10
+    voltages[1] += 0.5
+    currents[2] += 0.5
+    voltages[5] += 0.5
+    model.set_values(voltages, currents)
+    assert model.changes == [((1, VOLTAGE), (2, CURRENT)), ((5, VOLTAGE), (5, CURRENT))]
+    assert model.data(model.index(1, VOLTAGE)) == "1.50"
+
+
+def test_changes_below_display_precision_are_not_signalled(model):
+    model.set_values(np.arange(6.0) + 0.001, np.arange(6.0) * 10 - 0.002)
+    assert model.changes == []
+
+
+def test_states_signal_only_the_status_cells_of_compared_rails(model):
+    states = np.full(6, OK, dtype=np.int8)
+    states[[0, 3]] = OFF
+    model.set_states(states, rails=[3, 4])
+    assert model.changes == [((3, STATUS), (3, STATUS))]
+    assert model.data(model.index(0, STATUS)) == model.data(model.index(1, STATUS))
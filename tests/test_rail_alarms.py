@@ -0,0 +1,51 @@
+import numpy as np
+
+from rail_alarms import RailAlarms, OK, UNDERVOLTAGE, OVERCURRENT, OFF
+
+
+def twelve_volt_rail(debounce=1):
+    # the 12V rail of rails.json
+    return RailAlarms([12.0], 0.05, [1375.0], [1100.0], debounce=debounce)
+
+
+def test_undervoltage_rail_at_normal_current_stays_undervoltage():
+    alarms = twelve_volt_rail()
+    alarms.update(np.array([11.0]), np.array([1100.0]))
+    assert alarms.state[0] == UNDERVOLTAGE
+    for _ in range(5):
+        alarms.update(np.array([11.0]), np.array([1150.0]))
+    assert alarms.state[0] == UNDERVOLTAGE
+
+
+def test_overcurrent_clears_inside_the_current_band():
+    alarms = twelve_volt_rail()
+    alarms.update(np.array([12.0]), np.array([1400.0]))
+    assert alarms.state[0] == OVERCURRENT
+    # below the limit, but not by hysteresis * (1375 - 1100) yet
+    alarms.update(np.array([12.0]), np.array([1340.0]))
+    assert alarms.state[0] == OVERCURRENT
+    alarms.update(np.array([12.0]), np.array([1300.0]))
+    assert alarms.state[0] == OK
+
+
+def test_debounce_and_disabled_rails():
+    alarms = RailAlarms([3.3, 5.0], 0.1, [15.0, 37.5], [12.0, 30.0], debounce=3)
+    alarms.set_enabled(1, False)
+    low = np.array([2.5, 2.5]), np.array([12.0, 30.0])
+    assert len(alarms.update(*low)) == 0
+    assert len(alarms.update(*low)) == 0
+    assert list(alarms.update(*low)) == [0]
+    assert list(alarms.state) == [UNDERVOLTAGE, OFF]
+
+
+def test_update_many_matches_update():
+    rng = np.random.default_rng(1)
+    nominal = np.array([3.3, 5.0, 12.0, 19.0])
+    nominal_current = np.array([12.0, 30.0, 1100.0, 6000.0])
+    voltages = nominal * (1 + rng.normal(0, 0.06, (2000, 4)))
+    currents = nominal_current * (1 + rng.normal(0, 0.15, (2000, 4)))
+    one, batch = (RailAlarms(nominal, 0.05, nominal_current * 1.25, nominal_current) for _ in range(2))
+    for v, i in zip(voltages, currents):
+        one.update(v, i)
+    batch.update_many(voltages, currents)
+    assert np.array_equal(one.state, batch.state)
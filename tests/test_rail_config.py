@@ -0,0 +1,53 @@
+import json
+
+import numpy as np
+import pytest
+
+from rail_config import RailConfig, RAILS_FILE
+
+
+@pytest.fixture
+def rails():
+    return RailConfig.load()
+
+
+def test_split_one_sample_and_batches(rails):
+    n = len(rails)
+    voltages, currents = rails.split(np.arange(2 * n))
+    assert list(voltages) == list(range(n)) and list(currents) == list(range(n, 2 * n))
+    voltages, currents = rails.split(np.zeros((7, 2 * n)))
+    assert voltages.shape == currents.shape == (7, n)
+
+
+@pytest.mark.parametrize("extra", [-2, -1, 1, 2])
+def test_split_rejects_samples_of_other_rails(rails, extra):
+    with pytest.raises(ValueError):
+        rails.split(np.zeros((3, 2 * len(rails) + extra)))
+
+
+def test_channel_names_match_split_order(rails):
+    names = np.array(rails.channel_names())
+    voltages, currents = rails.split(names)
+    assert all(name.endswith("voltage") for name in voltages)
+    assert all(name.endswith("current") for name in currents)
+
+
+@pytest.mark.parametrize("operation", [
+    {"label": "Panic"},
+    {"label": "Panic", "keep": "essential", "off": "essential"},
+    {"keep": "essential"},
+    {"label": "Panic", "off": "nonexistent"},
+])
+def test_bad_operations_are_rejected(operation):
+    with open(RAILS_FILE) as f:
+        config = json.load(f)
+    with pytest.raises(ValueError, match="operation"):
+        RailConfig(config["rails"], config["commands"], config["groups"], [operation])
+
+
+def test_operations_switch_off_the_right_rails(rails):
+    labels = [label for label, _ in rails.operations]
+    keep_essential, main_bus = (off for _, off in rails.operations)
+    assert len(labels) == 2
+    assert not keep_essential[rails.index["19V"]] and keep_essential[rails.index["12V"]]
+    assert list(main_bus) == [name == "56V" for name in rails.names]
@@ -0,0 +1,127 @@
+import time
+
+import pytest
+
+from serial_protocol import PipelinedSender, command_echo
+
+
+class ScriptedPort:
+    """
+    Stand-in for serial.Serial: write() is recorded, read() returns what the
+    test queued with reply().
+    """
+    def __init__(self):
+        self.written = bytearray()
+        self._incoming = bytearray()
+
+    @property
+    def in_waiting(self):
+        return len(self._incoming)
+
+    def write(self, data):
+        self.written += data
+
+    def read(self, size):
+        data = bytes(self._incoming[:size])
+        del self._incoming[:size]
+        return data
+
+    def reset_input_buffer(self):
+        self._incoming.clear()
+
+    def reply(self, command, answer=None):
+        echo = command_echo(command)
+        self._incoming += echo + b"\r\n" + (answer + b"\r\n" if answer else b"") + b"end\r\n"
+
+
+def test_command_echo():
+    assert command_echo("power 3v3 on\n") == b"power 3v3 on"
+    assert command_echo("green\r\n") == b"green"
+
+
+def test_late_reply_is_not_taken_for_the_next_command():
+    port = ScriptedPort()
+    sender = PipelinedSender(port, window=4, timeout=0.01)
+    red = sender.submit("red\n")
+    sender.pump()
+    time.sleep(0.02)
+    sender.pump()
+    with pytest.raises(TimeoutError):
+        red.result(0)
+
+    green = sender.submit("green\n")
+    off = sender.submit("off\n")
+    sender.pump()
+    # the slow reply to "red" arrives only now, before the others
+    port.reply("red\n", b"red")
+    port.reply("green\n", b"green")
+    port.reply("off\n", b"off")
+    sender.drain()
+    assert green.result(0) == [b"green", b"green"]
+    assert off.result(0) == [b"off", b"off"]
+
+
+def test_lost_reply_fails_only_its_command():
+    port = ScriptedPort()
+    sender = PipelinedSender(port, window=4, timeout=1.0)
+    red = sender.submit("red\n")
+    blue = sender.submit("blue\n")
+    sender.pump()
+    port.reply("blue\n", b"blue")
+    sender.pump()
+    with pytest.raises(TimeoutError):
+        red.result(0)
+    assert blue.result(0) == [b"blue", b"blue"]
+    assert not sender.busy()
+
+
+def test_timed_out_reply_that_never_comes_does_not_swallow_others():
+    port = ScriptedPort()
+    sender = PipelinedSender(port, window=4, timeout=0.01)
+    red = sender.submit("red\n")
+    sender.pump()
+    time.sleep(0.02)
+    sender.pump()
+    assert red.exception(0) is not None
+
+    green = sender.submit("green\n")
+    sender.pump()
+    port.reply("green\n", b"green")
+    sender.drain()
+    assert green.result(0) == [b"green", b"green"]
+
+
+def test_lost_reply_does_not_fail_every_repeat_of_its_command():
+    port = ScriptedPort()
+    sender = PipelinedSender(port, window=1, timeout=0.01)
+    first = sender.submit("green\n")
+    sender.pump()
+    time.sleep(0.02)
+    sender.pump()   # its reply is lost for good
+    assert first.exception(0) is not None
+
+    for _ in range(5):
+        green = sender.submit("green\n")
+        sender.pump()
+        port.reply("green\n", b"green")
+        sender.drain()
+        assert green.result(0) == [b"green", b"green"]
+    assert not sender._abandoned
+
+
+def test_abandoned_echoes_expire():
+    port = ScriptedPort()
+    sender = PipelinedSender(port, window=4, timeout=0.01)
+    for command in ("red\n", "blue\n"):
+        sender.submit(command)
+    sender.pump()
+    time.sleep(0.02)
+    sender.pump()
+    assert len(sender._abandoned) == 2
+    time.sleep(0.02)
+    off = sender.submit("off\n")
+    sender.pump()
+    assert not sender._abandoned
+    port.reply("off\n", b"off")
+    sender.drain()
+    assert off.result(0) == [b"off", b"off"]
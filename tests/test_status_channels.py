@@ -0,0 +1,25 @@
+from status_channels import StatusChannels
+
+
+def test_callback_that_unsubscribes_while_published_skips_nobody():
+    channels = StatusChannels()
+    calls = []
+
+    def once(name, value):
+        calls.append(("once", value))
+        channels.unsubscribe(name, once)
+
+    channels.subscribe("led.state", once)
+    channels.subscribe("led.state", lambda name, value: calls.append(("other", value)))
+    channels.publish("led.state", "on")
+    channels.publish("led.state", "off")
+    assert calls == [("once", "on"), ("other", "on"), ("other", "off")]
+    assert channels.subscriber_count("led.state") == 1
+
+
+def test_new_subscriber_gets_the_latest_value():
+    channels = StatusChannels()
+    channels.publish("battery.voltage", 12.5)
+    calls = []
+    channels.subscribe("battery.voltage", lambda name, value: calls.append(value))
+    assert calls == [12.5]
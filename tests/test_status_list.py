@@ -0,0 +1,74 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QCoreApplication
+
+from status_channels import StatusChannels
+from status_list import StatusListModel, STATUS_PANELS, RowsRole, KindRole
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture
+def model(app):
+    return StatusListModel(StatusChannels())
+
+
+def counts(model):
+    return {name: model.channels.subscriber_count(name)
+            for kind in STATUS_PANELS for _, name, _ in STATUS_PANELS[kind][1]}
+
+
+def test_rows_are_added_and_removed(model):
+    inserted, removed = [], []
+    model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+    model.rowsAboutToBeRemoved.connect(lambda parent, first, last: removed.append((first, last)))
+    for kind in ("battery", "led", "motor", "led"):
+        model.add_panel(kind)
+    model.remove_panel(1)
+    assert inserted == [(0, 0), (1, 1), (2, 2), (3, 3)] and removed == [(1, 1)]
+    assert [model.data(model.index(row), KindRole) for row in range(model.rowCount())] == ["battery", "motor", "led"]
+    assert model.data(model.index(2)) == "LED Status"
+
+
+def test_one_subscription_per_channel_however_often_panels_are_reused(model):
+    for _ in range(50):
+        for kind in ("battery", "battery", "led"):
+            model.add_panel(kind)
+        # close them in another order than they were opened
+        for row in (1, 0, 0):
+            model.remove_panel(row)
+    assert model.rowCount() == 0 and set(counts(model).values()) == {0}
+
+    model.add_panel("battery")
+    model.add_panel("battery")
+    model.add_panel("led")
+    assert counts(model)["battery.voltage"] == 1 and counts(model)["led.color"] == 1
+    assert counts(model)["motor.speed"] == 0
+    model.remove_panel(0)
+    assert counts(model)["battery.voltage"] == 1
+    model.remove_panel(0)
+    assert counts(model)["battery.voltage"] == 0 and counts(model)["led.state"] == 1
+
+
+def test_published_values_are_flushed_for_the_panels_showing_them(model):
+    for kind in ("motor", "battery", "led", "battery"):
+        model.add_panel(kind)
+    changes = []
+    model.dataChanged.connect(lambda top_left, bottom_right, roles: changes.append((top_left.row(), bottom_right.row())))
+    model.channels.publish("battery.voltage", 12.34)
+    model.channels.publish("battery.current", 0.5)
+    assert changes == []     # gathered until the flush
+    model.flush()
+    assert changes == [(1, 3)]
+    rows = dict(model.data(model.index(3), RowsRole))
+    assert rows["Voltage"] == "12.3V"
+    assert rows["Temperature"] == "--"
+    model.flush()
+    assert changes == [(1, 3)]
@@ -0,0 +1,71 @@
+import os
+import gc
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QCoreApplication, QEvent
+from PyQt6.QtWidgets import QApplication
+
+from RoverGUI import StatusSelectionWidget, STATUS_POOL_SIZE
+from status_channels import StatusChannels
+
+CYCLES = 3000
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def rss_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def open_and_close(widget, cycles):
+    for k in range(cycles):
+        widget.add_status_groupbox(1 + k % 3)
+        widget.add_status_groupbox(1 + (k + 1) % 3)
+        panels = [item.widget() for item in map(widget.main_layout.itemAt, range(widget.main_layout.count()))]
+        assert len(panels) == 4   # instruction label, selector and the two panels
+        for panel in panels[2:]:
+            panel.close_button.click()
+        # what the event loop does between clicks
+        QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+        QCoreApplication.processEvents()
+    gc.collect()
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="needs /proc for RSS")
+def test_widgets_and_rss_stay_flat_over_open_close_cycles(app):
+    channels = StatusChannels()
+    widget = StatusSelectionWidget(channels)
+    widget.show()
+    # warm up: fill the pools and let allocators settle
+    open_and_close(widget, 200)
+    widgets, rss = len(QApplication.allWidgets()), rss_bytes()
+
+    open_and_close(widget, CYCLES)
+    assert len(QApplication.allWidgets()) == widgets
+    assert rss_bytes() - rss < 8 << 20
+    assert all(len(pool) <= STATUS_POOL_SIZE for pool in widget.panel_pools.values())
+    # closed panels hold no subscriptions
+    assert channels.subscriber_count("battery.voltage") == 0
+    assert channels.subscriber_count("led.state") == 0
+
+
+def test_reused_panel_subscribes_once(app):
+    channels = StatusChannels()
+    widget = StatusSelectionWidget(channels)
+    widget.show()
+    for _ in range(5):
+        widget.add_status_groupbox(1)     # battery, from the pool after the first pass
+        panel = widget.main_layout.itemAt(2).widget()
+        assert channels.subscriber_count("battery.voltage") == 1
+        channels.publish("battery.voltage", 12.0)
+        panel.close_button.click()
+        QCoreApplication.processEvents()
+        assert channels.subscriber_count("battery.voltage") == 0
+    assert len(widget.panel_pools[type(panel)]) == 1
@@ -0,0 +1,50 @@
+import numpy as np
+
+from telemetry_buffer import TelemetryRing, TelemetryStore
+
+
+def values(times):
+    return np.stack([times, -times], axis=1)
+
+
+def test_append_wraps_around_and_keeps_the_newest():
+    ring = TelemetryRing(["a", "b"], capacity=5)
+    for k in range(12):
+        ring.append([k, -k], timestamp=float(k))
+    times, vals = ring.last()
+    assert list(times) == [7, 8, 9, 10, 11]
+    assert vals.tolist() == values(np.arange(7.0, 12.0)).tolist()
+    assert list(ring.latest()) == [11, -11]
+    # the window is a view of the ring, not a copy
+    assert np.shares_memory(times, ring._times)
+
+
+def test_extend_across_the_end_and_longer_than_capacity():
+    ring = TelemetryRing(["a", "b"], capacity=8)
+    ring.extend(np.arange(6.0), values(np.arange(6.0)))
+    ring.extend(np.arange(6.0, 11.0), values(np.arange(6.0, 11.0)))   # wraps at 8
+    times, vals = ring.last()
+    assert list(times) == list(range(3, 11)) and ring.count == 8
+    assert vals.tolist() == values(np.arange(3.0, 11.0)).tolist()
+
+    ring.extend(np.arange(11.0, 31.0), values(np.arange(11.0, 31.0)))
+    times, vals = ring.last()
+    assert list(times) == list(range(23, 31))
+    assert list(ring.last(3)[0]) == [28, 29, 30]
+
+
+def test_window_and_channel():
+    ring = TelemetryRing(["a", "b"], capacity=100)
+    ring.extend(np.arange(150) * 0.1, values(np.arange(150) * 0.1))
+    times, _ = ring.window(1.0)
+    assert times[0] >= 13.9 - 1e-9 and times[-1] == ring.last()[0][-1]
+    times, b = ring.channel("b", 4)
+    assert np.allclose(b, -times)
+
+
+def test_clear_and_store():
+    store = TelemetryStore({"voltage": ["a", "b"], "current": ["a", "b"]}, capacity=4)
+    store.append("voltage", [1, 2], 0.0)
+    assert store["voltage"].count == 1 and store["current"].latest() is None
+    store.clear()
+    assert store["voltage"].count == 0 and len(store["voltage"].last()[0]) == 0
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from telemetry_frame import (
+    FrameDecoder, encode_samples, encode_message, decode_samples, decode_message,
+    FRAME_SAMPLES, FRAME_STATE, MAX_SAMPLES_PER_FRAME,
+)
+
+
+def sample_frames(count, per_frame=MAX_SAMPLES_PER_FRAME):
+    rng = np.random.default_rng(0)
+    frames = []
+    for k in range(count):
+        t = np.arange(per_frame, dtype=np.uint32) + k * per_frame
+        frames.append(encode_samples(t, rng.normal(size=(per_frame, 12))))
+    return frames
+
+
+def decode_in_chunks(decoder, stream):
+    samples = 0
+    for start in range(0, len(stream), decoder.chunk_size):
+        for frame_type, payload in decoder.feed(stream[start:start + decoder.chunk_size]):
+            assert frame_type == FRAME_SAMPLES
+            samples += len(decode_samples(payload))
+    return samples
+
+
+def test_round_trip():
+    decoder = FrameDecoder()
+    stream = encode_samples([1, 2], np.ones((2, 12))) + encode_message(FRAME_STATE, {"state": "open"})
+    (t1, p1), (t2, p2) = decoder.feed(stream)
+    assert t1 == FRAME_SAMPLES and list(decode_samples(p1)["t"]) == [1, 2]
+    assert t2 == FRAME_STATE and decode_message(p2) == {"state": "open"}
+
+
+def test_backlog_in_chunks_decodes_every_frame():
+    # several MB, as after a viewer stalled for a few seconds
+    stream = b"".join(sample_frames(60))
+    decoder = FrameDecoder()
+    assert decode_in_chunks(decoder, stream) == 60 * MAX_SAMPLES_PER_FRAME
+    assert decoder.crc_errors == 0 and decoder.bytes_skipped == 0
+
+
+def test_frames_straddling_the_buffer_end():
+    # odd frame sizes so frames start at every position of the buffer
+    stream = b"".join(sample_frames(200, per_frame=97))
+    decoder = FrameDecoder()
+    assert decode_in_chunks(decoder, stream) == 200 * 97
+    assert decoder.crc_errors == 0 and decoder.bytes_skipped == 0
+
+
+def test_oversized_feed_raises_and_reset_resyncs():
+    decoder = FrameDecoder()
+    frames = sample_frames(3)
+    with pytest.raises(BufferError):
+        decoder.feed(b"".join(frames))
+    decoder.reset()
+    assert decode_in_chunks(decoder, frames[0]) == MAX_SAMPLES_PER_FRAME
@@ -0,0 +1,64 @@
+import socket
+import selectors
+import threading
+
+import pytest
+
+from telemetry_frame import (
+    FrameDecoder, encode_frame, encode_message, decode_message, FRAME_COMMAND, FRAME_ERROR,
+)
+from telemetry_hub import TelemetryHub, Subscriber
+
+
+@pytest.fixture
+def hub(tmp_path):
+    hub = TelemetryHub(str(tmp_path / "hub.sock")).listen()
+    thread = threading.Thread(target=hub.serve_forever, daemon=True)
+    thread.start()
+    yield hub
+    hub.stop()
+    thread.join(5)
+
+
+def connect(hub):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(hub.address)
+    sock.settimeout(5)
+    return sock
+
+
+def errors(sock, count):
+    decoder, found = FrameDecoder(), []
+    while len(found) < count:
+        for frame_type, payload in decoder.feed(sock.recv(4096)):
+            if frame_type == FRAME_ERROR:
+                found.append(decode_message(payload))
+    return found
+
+
+def test_bad_commands_are_answered_to_their_sender_only(hub):
+    bad, good = connect(hub), connect(hub)
+    bad.sendall(encode_frame(FRAME_COMMAND, b'{"cmd": 1}') +
+                encode_frame(FRAME_COMMAND, b"not json") +
+                encode_frame(FRAME_COMMAND, b'{"command": 5}'))
+    assert [e["error"].startswith("bad command") for e in errors(bad, 3)] == [True] * 3
+
+    # the hub is still serving: without a link it refuses commands politely
+    good.sendall(encode_message(FRAME_COMMAND, {"command": "green\n"}))
+    assert errors(good, 1) == [{"command": "green\n", "error": "hub has no serial link"}]
+
+
+def test_client_that_fails_a_send_is_dropped_once(tmp_path):
+    hub = TelemetryHub(str(tmp_path / "hub.sock")).listen()
+    ours, theirs = socket.socketpair()
+    ours.setblocking(False)
+    client = Subscriber(ours, "pair")
+    hub.clients[ours] = client
+    hub._selector.register(ours, selectors.EVENT_READ, hub._service)
+    # two bad commands, and the client is gone before the answers
+    theirs.sendall(encode_frame(FRAME_COMMAND, b"not json") * 2)
+    theirs.close()
+    hub._service(ours, selectors.EVENT_READ | selectors.EVENT_WRITE)
+    assert ours not in hub.clients and ours.fileno() == -1
+    hub._drop_client(client)
+    hub._close()
@@ -0,0 +1,107 @@
+import os
+import json
+import time
+
+import numpy as np
+import pytest
+
+from telemetry_recorder import TelemetryRecorder, TelemetryLog, record_dtype, segment_name
+
+CHANNELS = ["a voltage", "a current"]
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_segments_roll_by_time(tmp_path):
+    recorder = TelemetryRecorder(str(tmp_path), CHANNELS, segment_seconds=0.05).start()
+    for k in range(10):
+        recorder.record_many(np.arange(10) + 10.0 * k, np.ones((10, 2)))
+        time.sleep(0.02)
+    recorder.stop()
+    log = TelemetryLog(str(tmp_path))
+    assert len(log.manifest) > 1
+    assert all(entry["name"].endswith(".bin") for entry in log.manifest)
+    assert len(log) == 100
+    assert list(np.concatenate([s["t"] for s in log.segments()])) == list(np.arange(100.0))
+
+
+def test_running_session_is_readable_and_seekable(tmp_path):
+    recorder = TelemetryRecorder(str(tmp_path), CHANNELS, index_every=16).start()
+    recorder.record_many(np.arange(1000) / 10, np.zeros((1000, 2)))
+    wait_for(lambda: recorder.written == 1000)
+    time.sleep(0.05)   # let the writer flush
+
+    log = TelemetryLog(str(tmp_path))
+    assert not os.path.exists(tmp_path / "manifest.json")
+    assert len(log) == 1000
+    assert log.locate(50.0) == (0, 500)
+    assert sum(len(part) for part in log.time_range(10.0, 20.0)) == 100
+
+    recorder.record_many(np.arange(1000, 1500) / 10, np.zeros((500, 2)))
+    wait_for(lambda: recorder.written == 1500)
+    time.sleep(0.05)
+    log.refresh()
+    assert len(log) == 1500
+    recorder.stop()
+
+
+def test_crashed_session_is_recovered(tmp_path):
+    recorder = TelemetryRecorder(str(tmp_path), CHANNELS, segment_records=100)
+    recorder.start()
+    recorder.record_many(np.arange(250) * 0.1, np.zeros((250, 2)))
+    recorder.stop()
+    # as after a crash: the last segment was renamed but not put in the
+    # manifest yet, and the next .part ends in a torn record
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text(json.dumps(json.loads(manifest_path.read_text())[:2]))
+    records = np.empty(30, dtype=record_dtype(2))
+    records["t"] = 30.0 + np.arange(30) * 0.1
+    records["values"] = 0
+    with open(tmp_path / (segment_name(3) + ".part"), "wb") as f:
+        f.write(records.tobytes() + b"\x01\x02\x03")
+
+    log = TelemetryLog(str(tmp_path))
+    assert [entry["name"] for entry in log.manifest][2:] == [segment_name(2), segment_name(3) + ".part"]
+    assert len(log) == 280
+    assert log.locate(31.0) == (3, 10)
+    assert os.path.getsize(tmp_path / (segment_name(3) + ".part")) == records.nbytes + 3
+
+
+def test_seek_across_finished_and_open_segments(tmp_path):
+    recorder = TelemetryRecorder(str(tmp_path), CHANNELS, segment_records=300, index_every=32).start()
+    recorder.record_many(np.arange(1000) * 0.5, np.zeros((1000, 2)))
+    wait_for(lambda: recorder.written == 1000)
+    time.sleep(0.05)
+
+    log = TelemetryLog(str(tmp_path))
+    assert [entry["records"] for entry in log.manifest] == [300, 300, 300, 100]
+    assert log.manifest[-1]["name"].endswith(".part")
+    for t in (0.0, 149.75, 150.0, 333.3, 450.0, 499.5):
+        segment, offset = log.locate(t)
+        assert log.segment(segment)["t"][offset] == np.ceil(t * 2) / 2
+    assert log.locate(1000.0) == (4, 0)
+    recorder.stop()
+
+
+def test_writer_error_is_reported_and_stop_does_not_hang(tmp_path):
+    recorder = TelemetryRecorder(str(tmp_path), CHANNELS, queue_size=4)
+
+    def disk_full(items):
+        raise OSError(28, "No space left on device")
+    recorder._to_records = disk_full
+    recorder.start()
+    recorder.record(0.0, [1.0, 2.0])
+    wait_for(lambda: recorder.error is not None)
+    for k in range(10):
+        recorder.record(k, [1.0, 2.0])
+    assert recorder.dropped == 10
+
+    started = time.monotonic()
+    with pytest.raises(OSError):
+        recorder.stop()
+    assert time.monotonic() - started < 1.0